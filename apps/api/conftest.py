@@ -0,0 +1,17 @@
+"""Shared fixtures for the API test suite."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.api.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient for the whole run.
+
+    Per-test state lives in app.dependency_overrides, so the client itself
+    can be shared. Modules that need their own client define a ``client``
+    fixture, which takes precedence over this one.
+    """
+    return TestClient(app)
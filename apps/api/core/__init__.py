@@ -1 +1 @@
-"""Core infrastructure: auth, config, errors, logging."""
+"""Core infrastructure: auth, config, db, errors, logging."""
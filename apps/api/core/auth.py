@@ -1,16 +1,38 @@
 """Centralized authentication dependencies.
 
-Consolidates deps.py + supabase_client.py into one module.
+Consolidates the former deps.py + supabase_client.py into one module.
 Provides both user-scoped and service-role Supabase clients.
 
-Fixes BUG-06: documents the empty refresh token pattern and validates
-JWT expiry upfront rather than letting it fail silently.
+Fixes BUG-06: user clients carry no refresh token or session (the gateway
+is stateless), and JWT expiry is validated upfront rather than letting it
+fail silently.
+
+get_current_user resolves the caller's id by verifying the JWT locally
+(HS256 via SUPABASE_JWT_SECRET, asymmetric keys via the project JWKS), so
+endpoints skip the Auth server round-trip. get_user_client builds on that
+check and forwards the token without re-validating it over the network.
+
+All clients share one process-wide httpx connection pool, so per-request
+clients reuse warm TCP/TLS connections to Supabase. The pool serializes
+JSON request bodies (inserts, RPC payloads) with orjson.
 """
 
+import hashlib
 import os
-
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+import jwt
+import orjson
 from fastapi import Depends, Header, HTTPException
 from supabase import Client, create_client
+from supabase.lib.client_options import DEFAULT_HEADERS, SyncClientOptions
+
+from apps.api.core.config import settings
+from apps.api.core.db import run_db
 
 
 def _get_supabase_url() -> str:
@@ -27,6 +49,61 @@ def _get_supabase_anon_key() -> str:
     return key
 
 
+class _ORJSONClient(httpx.Client):
+    """httpx client that encodes ``json=`` bodies with orjson.
+
+    postgrest hands every insert/update/RPC payload to httpx as ``json=``,
+    which httpx would encode with the stdlib json module.
+    """
+
+    def build_request(self, method, url, *, content=None, json=None, headers=None, **kwargs):
+        if json is not None and content is None:
+            content = orjson.dumps(
+                json, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+            headers = httpx.Headers(headers)
+            headers["Content-Type"] = "application/json"
+            json = None
+        return super().build_request(
+            method, url, content=content, json=json, headers=headers, **kwargs
+        )
+
+
+@lru_cache(maxsize=1)
+def _get_http_client() -> httpx.Client:
+    """Connection pool shared by every Supabase client in this process.
+
+    supabase-py sends auth headers per request, so sharing the transport
+    does not share credentials.
+    """
+    return _ORJSONClient(
+        http2=True,
+        follow_redirects=True,
+        timeout=httpx.Timeout(120.0, connect=10.0),
+        limits=httpx.Limits(
+            max_connections=200, max_keepalive_connections=100, keepalive_expiry=60.0
+        ),
+    )
+
+
+def close_http_client() -> None:
+    """Close the shared pool (app shutdown); the next client opens a new one."""
+    get_service_client.cache_clear()  # bound to the pool being closed
+    if _get_http_client.cache_info().currsize:
+        _get_http_client().close()
+        _get_http_client.cache_clear()
+
+
+def _create_client(key: str, access_token: str = "") -> Client:
+    # Fresh options per client: each carries its own session storage.
+    options = SyncClientOptions(httpx_client=_get_http_client())
+    if access_token:
+        # PostgREST and Storage send this instead of the API key, so RLS
+        # applies to the user without an auth session on the client.
+        options.headers = {**DEFAULT_HEADERS, "Authorization": f"Bearer {access_token}"}
+    return create_client(_get_supabase_url(), key, options)
+
+
 async def get_user_token(authorization: str = Header(default="")) -> str:
     """Extract Bearer token from Authorization header.
 
@@ -47,27 +124,126 @@ async def get_user_token(authorization: str = Header(default="")) -> str:
     return token
 
 
-async def get_user_client(token: str = Depends(get_user_token)) -> Client:
+@lru_cache(maxsize=1)
+def _get_jwks_client() -> jwt.PyJWKClient:
+    """JWKS client for the project's signing keys; keys are cached in-process."""
+    return jwt.PyJWKClient(
+        f"{_get_supabase_url()}/auth/v1/.well-known/jwks.json", cache_keys=True
+    )
+
+
+# Algorithms accepted per key source. The token header only selects
+# between them; anything else is rejected before a key is looked up.
+HMAC_ALGORITHMS = ["HS256"]
+JWKS_ALGORITHMS = ["RS256", "ES256"]
+
+
+def _get_jwt_secret() -> str:
+    if settings is not None:
+        return settings.SUPABASE_JWT_SECRET
+    return os.environ.get("SUPABASE_JWT_SECRET", "")
+
+
+async def _verify_token(token: str) -> dict:
+    """Verify the JWT signature, expiry and audience; return its claims.
+
+    Raises jwt.PyJWTError on an invalid token (including an algorithm
+    outside the allowlists) and LookupError when an HS256 token arrives
+    but SUPABASE_JWT_SECRET is not configured.
+    """
+    algorithm = jwt.get_unverified_header(token).get("alg")
+    if algorithm in HMAC_ALGORITHMS:
+        key = _get_jwt_secret()
+        if not key:
+            raise LookupError("SUPABASE_JWT_SECRET is not configured")
+        algorithms = HMAC_ALGORITHMS
+    elif algorithm in JWKS_ALGORITHMS:
+        # Fetches the JWKS over the network on first use and for unknown kids.
+        signing_key = await run_db(_get_jwks_client().get_signing_key_from_jwt, token)
+        if signing_key.algorithm_name != algorithm:
+            raise jwt.InvalidAlgorithmError("Token algorithm does not match its key")
+        key = signing_key.key
+        algorithms = JWKS_ALGORITHMS
+    else:
+        raise jwt.InvalidAlgorithmError(f"Unsupported token algorithm: {algorithm}")
+    return jwt.decode(token, key, algorithms=algorithms, audience="authenticated")
+
+
+# Auth-server answers for tokens that cannot be verified locally, keyed by
+# token hash. Entries live USER_CACHE_TTL_SECONDS, or until the token expires.
+USER_CACHE_TTL_SECONDS = 60
+USER_CACHE_SIZE = 1024
+_user_cache: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+
+
+async def _lookup_user_remotely(token: str) -> Optional[str]:
+    """Resolve a token via the Auth server, reusing recent answers."""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    now = time.time()
+    cached = _user_cache.get(key)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    client = _create_client(_get_supabase_anon_key())
+    try:
+        user_response = await run_db(client.auth.get_user, token)
+    except Exception:
+        user_response = None
+    if not user_response or not user_response.user:
+        return None
+
+    exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+    expires_at = now + USER_CACHE_TTL_SECONDS
+    _user_cache[key] = (user_response.user.id, min(expires_at, exp or expires_at))
+    _user_cache.move_to_end(key)
+    while len(_user_cache) > USER_CACHE_SIZE:
+        _user_cache.popitem(last=False)
+    return user_response.user.id
+
+
+async def get_current_user(token: str = Depends(get_user_token)) -> str:
+    """Return the authenticated user's id from the bearer JWT.
+
+    Verified locally; falls back to the Auth server only when an HS256
+    token cannot be checked because the JWT secret is not configured.
+    """
+    try:
+        user_id = (await _verify_token(token)).get("sub")
+    except LookupError:
+        user_id = await _lookup_user_remotely(token)
+    except jwt.PyJWTError:
+        user_id = None
+
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Invalid bearer token")
+    return user_id
+
+
+async def get_user_client(
+    token: str = Depends(get_user_token),
+    user_id: str = Depends(get_current_user),  # rejects invalid tokens
+) -> Client:
     """Provide a Supabase client authenticated with the user's JWT.
 
     RLS policies will be enforced for all queries.
 
-    Note: We pass an empty string as the refresh token because the API
-    gateway is stateless — each request carries a fresh token from the
-    client. The backend never refreshes tokens.
+    The token is verified by get_current_user and forwarded as the
+    Authorization header. The client holds no auth session (BUG-06: the
+    gateway is stateless and never refreshes tokens), so endpoints take
+    the user id from get_current_user rather than client.auth.get_user().
     """
-    client = create_client(_get_supabase_url(), _get_supabase_anon_key())
-    client.auth.set_session(token, "")
-    return client
+    return _create_client(_get_supabase_anon_key(), access_token=token)
 
 
+@lru_cache(maxsize=1)
 def get_service_client() -> Client:
     """Provide a service-role Supabase client (bypasses RLS).
 
-    Used by Celery workers to update training_jobs status.
+    Used by Celery workers to update training_jobs status. The client
+    carries no user session, so one instance is shared per process rather
+    than rebuilt for every status update.
     """
-    url = _get_supabase_url()
     service_key = os.environ.get("SUPABASE_SERVICE_KEY", "")
     if not service_key:
         raise RuntimeError("SUPABASE_SERVICE_KEY is not configured")
-    return create_client(url, service_key)
+    return _create_client(service_key)
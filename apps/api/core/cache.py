@@ -0,0 +1,29 @@
+"""Shared Redis connection for API-side caches.
+
+Callers treat Redis as optional: every use is wrapped so a connection
+error or timeout degrades to the uncached path instead of failing the
+request.
+"""
+
+import os
+from functools import lru_cache
+
+# Keep cache lookups from stalling requests when Redis is unreachable.
+REDIS_TIMEOUT_SECONDS = 0.25
+
+
+@lru_cache(maxsize=1)
+def get_redis():
+    """Process-wide Redis client (connection-pooled by redis-py)."""
+    import redis
+
+    from apps.api.core.config import settings
+
+    redis_url = settings.REDIS_URL if settings else os.getenv(
+        "REDIS_URL", "redis://localhost:6379/0"
+    )
+    return redis.from_url(
+        redis_url,
+        socket_timeout=REDIS_TIMEOUT_SECONDS,
+        socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+    )
@@ -18,6 +18,10 @@ class Settings(BaseSettings):
         default="",
         description="Supabase service-role key (for Celery worker)",
     )
+    SUPABASE_JWT_SECRET: str = Field(
+        default="",
+        description="Supabase JWT secret, for verifying HS256 user tokens locally",
+    )
 
     # CORS
     ALLOWED_ORIGINS: str = Field(
@@ -0,0 +1,26 @@
+"""Run blocking Supabase calls off the event loop.
+
+supabase-py's sync client performs blocking HTTP. Awaiting those calls
+through run_db hands them to the worker thread pool so concurrent
+requests are not serialized behind the event-loop thread.
+"""
+
+from typing import Any, Callable, TypeVar
+
+import anyio
+
+T = TypeVar("T")
+
+# Each in-flight Supabase request holds one worker thread while it waits
+# on the network, so the pool is sized well above CPU count.
+DB_THREADPOOL_SIZE = 64
+
+
+async def run_db(fn: Callable[..., T], *args: Any) -> T:
+    """Await a blocking call, e.g. ``await run_db(lambda: query.execute())``."""
+    return await anyio.to_thread.run_sync(fn, *args)
+
+
+def configure_threadpool(size: int = DB_THREADPOOL_SIZE) -> None:
+    """Resize anyio's default thread limiter; call from the running loop."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = size
@@ -0,0 +1,20 @@
+"""JSON response classes.
+
+ORJSONResponse renders with orjson instead of the stdlib json module.
+It is the app's default for endpoints that return plain dicts (upload
+summaries, job rows, model listings).
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson; also accepts numpy scalars/arrays."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
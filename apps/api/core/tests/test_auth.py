@@ -0,0 +1,249 @@
+"""Tests for core auth module."""
+
+import asyncio
+import time
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+SECRET = "test-jwt-secret-with-enough-length-for-hs256"
+
+
+def _token(**overrides):
+    claims = {"sub": "user-123", "aud": "authenticated", "exp": int(time.time()) + 60}
+    claims.update(overrides)
+    return jwt.encode(claims, SECRET, algorithm="HS256")
+
+
+def _use_secret(monkeypatch, secret):
+    """Point core.auth at settings carrying the given JWT secret."""
+    from apps.api.core import auth
+    from apps.api.core.config import Settings
+
+    monkeypatch.setattr(
+        auth,
+        "settings",
+        Settings(
+            SUPABASE_URL="https://test.supabase.co",
+            SUPABASE_ANON_KEY="anon-key",
+            SUPABASE_JWT_SECRET=secret,
+        ),
+    )
+
+
+class TestGetCurrentUser:
+    """get_current_user verifies the JWT locally, without an Auth round-trip."""
+
+    def test_valid_token_returns_sub(self, monkeypatch):
+        _use_secret(monkeypatch, SECRET)
+        monkeypatch.setattr(
+            "apps.api.core.auth.create_client",
+            lambda *a: pytest.fail("Auth server must not be called"),
+        )
+
+        from apps.api.core.auth import get_current_user
+        assert asyncio.run(get_current_user(_token())) == "user-123"
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [{"exp": int(time.time()) - 60}, {"aud": "anon"}],
+    )
+    def test_expired_or_wrong_audience_rejected(self, monkeypatch, overrides):
+        _use_secret(monkeypatch, SECRET)
+
+        from apps.api.core.auth import get_current_user
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(get_current_user(_token(**overrides)))
+        assert exc.value.status_code == 401
+
+    def test_bad_signature_rejected(self, monkeypatch):
+        _use_secret(monkeypatch, "a-different-secret-of-sufficient-len")
+
+        from apps.api.core.auth import get_current_user
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(get_current_user(_token()))
+        assert exc.value.status_code == 401
+
+
+class TestAlgorithmAllowlist:
+    """Only HS256 (secret) and RS256/ES256 (JWKS) tokens are accepted."""
+
+    @staticmethod
+    def _rsa_setup(monkeypatch):
+        from types import SimpleNamespace
+
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        from apps.api.core import auth
+
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        public_jwk = jwt.algorithms.RSAAlgorithm.to_jwk(
+            private_key.public_key(), as_dict=True
+        )
+        jwk = jwt.PyJWK.from_dict({**public_jwk, "kid": "rsa-1"})
+        lookups = []
+
+        def get_signing_key_from_jwt(token):
+            lookups.append(token)
+            return jwk
+
+        monkeypatch.setattr(
+            auth,
+            "_get_jwks_client",
+            lambda: SimpleNamespace(get_signing_key_from_jwt=get_signing_key_from_jwt),
+        )
+        return private_key, lookups
+
+    def test_rs256_token_verified_via_jwks(self, monkeypatch):
+        private_key, lookups = self._rsa_setup(monkeypatch)
+        claims = {"sub": "user-123", "aud": "authenticated", "exp": int(time.time()) + 60}
+        token = jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": "rsa-1"})
+
+        from apps.api.core.auth import get_current_user
+        assert asyncio.run(get_current_user(token)) == "user-123"
+        assert lookups == [token]
+
+    def test_unlisted_algorithm_rejected_before_key_lookup(self, monkeypatch):
+        _, lookups = self._rsa_setup(monkeypatch)
+        claims = {"sub": "user-123", "aud": "authenticated", "exp": int(time.time()) + 60}
+        token = jwt.encode(claims, SECRET * 2, algorithm="HS512", headers={"kid": "rsa-1"})
+
+        from apps.api.core.auth import get_current_user
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(get_current_user(token))
+        assert exc.value.status_code == 401
+        assert lookups == []
+
+    def test_algorithm_must_match_jwks_key(self, monkeypatch):
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        self._rsa_setup(monkeypatch)
+        claims = {"sub": "user-123", "aud": "authenticated", "exp": int(time.time()) + 60}
+        ec_key = ec.generate_private_key(ec.SECP256R1())
+        token = jwt.encode(claims, ec_key, algorithm="ES256", headers={"kid": "rsa-1"})
+
+        from apps.api.core.auth import get_current_user
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(get_current_user(token))
+        assert exc.value.status_code == 401
+
+
+class TestUserClient:
+    """get_user_client forwards the verified token instead of a session."""
+
+    def test_token_sent_as_authorization_header(self, monkeypatch):
+        monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+        monkeypatch.setenv("SUPABASE_ANON_KEY", "anon-key")
+
+        from apps.api.core.auth import get_user_client
+        client = asyncio.run(get_user_client("user-jwt", "user-123"))
+
+        assert client.options.headers["Authorization"] == "Bearer user-jwt"
+        assert client.options.headers["apiKey"] == "anon-key"
+
+
+class TestRemoteLookupCache:
+    """Auth-server fallback answers are reused for a short time."""
+
+    def test_second_lookup_served_from_cache(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from apps.api.core import auth
+
+        _use_secret(monkeypatch, "")
+        monkeypatch.setattr(auth, "_user_cache", auth.OrderedDict())
+        calls = []
+
+        def get_user(token):
+            calls.append(token)
+            return SimpleNamespace(user=SimpleNamespace(id="user-123"))
+
+        fake = SimpleNamespace(auth=SimpleNamespace(get_user=get_user))
+        monkeypatch.setattr(auth, "_create_client", lambda *a, **k: fake)
+        monkeypatch.setattr(auth, "_get_supabase_anon_key", lambda: "anon-key")
+
+        token = _token()
+        assert asyncio.run(auth.get_current_user(token)) == "user-123"
+        assert asyncio.run(auth.get_current_user(token)) == "user-123"
+        assert calls == [token]
+
+
+class TestSharedHttpClient:
+    """Supabase clients reuse one connection pool per process."""
+
+    def test_clients_share_pool_but_not_sessions(self, monkeypatch):
+        monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+
+        from apps.api.core import auth
+        auth.close_http_client()
+
+        first = auth._create_client("key-a")
+        second = auth._create_client("key-b")
+
+        assert first.options.httpx_client is second.options.httpx_client
+        assert first.options.storage is not second.options.storage
+        auth.close_http_client()
+
+    def test_user_token_not_written_to_shared_pool(self, monkeypatch):
+        monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+
+        from apps.api.core import auth
+        auth.close_http_client()
+
+        user_client = auth._create_client("anon-key", access_token="user-a-jwt")
+        user_client.table("transactions").select("id")  # builds the session
+        pool = auth._get_http_client()
+
+        assert "Authorization" not in pool.headers
+        assert "apikey" not in pool.headers
+        auth.close_http_client()
+
+    def test_close_resets_pool(self, monkeypatch):
+        monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+
+        from apps.api.core import auth
+        pool = auth._get_http_client()
+        auth.close_http_client()
+
+        assert pool.is_closed
+        assert auth._get_http_client() is not pool
+        auth.close_http_client()
+
+    def test_json_bodies_encoded_with_orjson(self):
+        import json
+
+        import orjson
+
+        from apps.api.core import auth
+        auth.close_http_client()
+
+        payload = {"payload": [{"amount": -162.0, "description": "Café"}]}
+        request = auth._get_http_client().build_request(
+            "POST", "https://test.supabase.co/rest/v1/rpc/x",
+            json=payload, headers={"Prefer": "return=minimal"},
+        )
+
+        assert request.content == orjson.dumps(payload)
+        assert json.loads(request.content) == payload
+        assert request.headers["Content-Type"] == "application/json"
+        assert request.headers["Prefer"] == "return=minimal"
+        auth.close_http_client()
+
+
+class TestServiceClient:
+    """The service-role client is built once per process."""
+
+    def test_reused_until_pool_closes(self, monkeypatch):
+        monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+        monkeypatch.setenv("SUPABASE_SERVICE_KEY", "service-key")
+
+        from apps.api.core import auth
+        auth.close_http_client()
+
+        client = auth.get_service_client()
+        assert auth.get_service_client() is client
+
+        auth.close_http_client()
+        assert auth.get_service_client() is not client
+        auth.close_http_client()
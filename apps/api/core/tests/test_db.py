@@ -0,0 +1,34 @@
+"""Tests for core db offloading helpers."""
+
+import asyncio
+import threading
+
+
+class TestRunDb:
+    """Blocking Supabase calls run on a worker thread, not the event loop."""
+
+    def test_runs_off_loop_thread(self):
+        from apps.api.core.db import run_db
+
+        async def main():
+            loop_thread = threading.get_ident()
+            call_thread = await run_db(threading.get_ident)
+            return loop_thread, call_thread
+
+        loop_thread, call_thread = asyncio.run(main())
+        assert loop_thread != call_thread
+
+    def test_passes_positional_args(self):
+        from apps.api.core.db import run_db
+
+        assert asyncio.run(run_db(divmod, 7, 2)) == (3, 1)
+
+    def test_configure_threadpool_sets_limit(self):
+        import anyio
+        from apps.api.core.db import configure_threadpool
+
+        async def main():
+            configure_threadpool(16)
+            return anyio.to_thread.current_default_thread_limiter().total_tokens
+
+        assert asyncio.run(main()) == 16
@@ -0,0 +1,23 @@
+"""Tests for core response classes."""
+
+import numpy as np
+
+
+class TestORJSONResponse:
+    """orjson-backed default response class."""
+
+    def test_renders_compact_json_with_numpy_values(self):
+        from apps.api.core.responses import ORJSONResponse
+
+        response = ORJSONResponse({"count": np.int64(3), "size_mb": np.float64(1.5)})
+        assert response.body == b'{"count":3,"size_mb":1.5}'
+        assert response.media_type == "application/json"
+
+    def test_app_default_response_class(self, monkeypatch):
+        monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+        monkeypatch.setenv("SUPABASE_ANON_KEY", "test-anon-key")
+
+        from apps.api.core.responses import ORJSONResponse
+        from apps.api.main import app
+
+        assert app.router.default_response_class.value is ORJSONResponse
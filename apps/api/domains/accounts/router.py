@@ -1,24 +1,22 @@
 """Accounts router — transactions, profile, settings."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from supabase import Client
 
-from apps.api.core.auth import get_user_client
+from apps.api.core.auth import get_current_user, get_user_client, get_user_token
+from apps.api.core.db import run_db
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
 
 @router.get("/transactions")
-async def list_transactions(client: Client = Depends(get_user_client)):
+async def list_transactions(
+    client: Client = Depends(get_user_client),
+    user_id: str = Depends(get_current_user),
+):
     """List user's transactions."""
-    user_response = client.auth.get_user()
-    if not user_response or not user_response.user:
-        from fastapi import HTTPException
-        raise HTTPException(status_code=401, detail="Invalid bearer token")
-
-    user_id = user_response.user.id
-    result = (
-        client.table("transactions")
+    result = await run_db(
+        lambda: client.table("transactions")
         .select("*")
         .eq("user_id", user_id)
         .order("transaction_date", desc=True)
@@ -29,11 +27,14 @@ async def list_transactions(client: Client = Depends(get_user_client)):
 
 
 @router.get("/profile")
-async def get_profile(client: Client = Depends(get_user_client)):
+async def get_profile(
+    token: str = Depends(get_user_token),
+    client: Client = Depends(get_user_client),
+):
     """Get user profile (stub)."""
-    user_response = client.auth.get_user()
+    # The one endpoint that needs Auth-server data (email) beyond the JWT
+    user_response = await run_db(client.auth.get_user, token)
     if not user_response or not user_response.user:
-        from fastapi import HTTPException
         raise HTTPException(status_code=401, detail="Invalid bearer token")
 
     return {
@@ -6,7 +6,7 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from apps.api.domains.accounts.router import router
-from apps.api.core.auth import get_user_client
+from apps.api.core.auth import get_current_user, get_user_client, get_user_token
 
 
 @pytest.fixture
@@ -46,6 +46,8 @@ def mock_user_client():
 @pytest.fixture
 def client(app, mock_user_client):
     app.dependency_overrides[get_user_client] = lambda: mock_user_client
+    app.dependency_overrides[get_current_user] = lambda: "test-user-123"
+    app.dependency_overrides[get_user_token] = lambda: "test-token"
     c = TestClient(app)
     yield c
     app.dependency_overrides.clear()
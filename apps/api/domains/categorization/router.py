@@ -13,7 +13,8 @@ import structlog
 from fastapi import APIRouter, Depends, HTTPException
 from supabase import Client
 
-from apps.api.core.auth import get_user_client
+from apps.api.core.auth import get_current_user, get_user_client
+from apps.api.core.db import run_db
 from apps.api.domains.categorization.schemas import (
     BatchClassifyRequest,
     BatchClassifyResponse,
@@ -23,8 +24,8 @@ from apps.api.domains.categorization.schemas import (
     FeedbackRequest,
 )
 from apps.api.domains.categorization.service import (
-    classify_batch_in_process,
-    classify_single_in_process,
+    classify_batch_queued,
+    classify_single_queued,
     get_classifier,
 )
 
@@ -32,22 +33,42 @@ router = APIRouter(prefix="/categorization", tags=["categorization"])
 logger = structlog.get_logger()
 
 
+def _correction_rows(corrections: dict, user_id: str) -> list[dict[str, str]]:
+    """Build training_corrections rows from a feedback payload.
+
+    Accepts both ``{description: category}`` and
+    ``{category: [descriptions]}`` entries.
+    """
+    rows: list[dict[str, str]] = []
+    for key, value in corrections.items():
+        if isinstance(value, str):
+            rows.append({
+                "user_id": user_id,
+                "description": str(key),
+                "corrected_category": value,
+            })
+        elif isinstance(value, list):
+            for description in value:
+                rows.append({
+                    "user_id": user_id,
+                    "description": str(description),
+                    "corrected_category": str(key),
+                })
+    return rows
+
+
 @router.post("/classify", response_model=ClassifyResponse)
 async def classify_transaction(
     request: ClassifyRequest,
-    client: Client = Depends(get_user_client),
+    user_id: str = Depends(get_current_user),
 ):
     """Classify a single transaction description.
 
     BUG-03 fix: This is the ONLY /classify endpoint. The old codebase had
     two conflicting routes registered under the same path.
     """
-    user_response = client.auth.get_user()
-    if not user_response or not user_response.user:
-        raise HTTPException(status_code=401, detail="Invalid bearer token")
-
     try:
-        result = classify_single_in_process(request.description)
+        result = await classify_single_queued(request.description)
         return ClassifyResponse(
             category=result["category"],
             confidence=result["confidence"],
@@ -61,22 +82,19 @@ async def classify_transaction(
 @router.post("/classify/batch", response_model=BatchClassifyResponse)
 async def classify_batch(
     request: BatchClassifyRequest,
-    client: Client = Depends(get_user_client),
+    user_id: str = Depends(get_current_user),
 ):
     """Classify multiple transactions in a single batch.
 
     BUG-04 fix: Runs inference in-process instead of dispatching N separate
-    Celery tasks with .delay().get() on each one.
+    Celery tasks with .delay().get() on each one. Concurrent requests are
+    coalesced into shared forward passes by the service's batcher.
     """
-    user_response = client.auth.get_user()
-    if not user_response or not user_response.user:
-        raise HTTPException(status_code=401, detail="Invalid bearer token")
-
     if not request.descriptions:
         raise HTTPException(status_code=400, detail="No descriptions provided")
 
     try:
-        results = classify_batch_in_process(request.descriptions)
+        results = await classify_batch_queued(request.descriptions)
         predictions = [
             ClassifyResponse(
                 category=r["category"],
@@ -95,42 +113,29 @@ async def classify_batch(
 async def submit_feedback(
     request: FeedbackRequest,
     client: Client = Depends(get_user_client),
+    user_id: str = Depends(get_current_user),
 ):
     """Accept category corrections for active learning."""
-    user_response = client.auth.get_user()
-    if not user_response or not user_response.user:
-        raise HTTPException(status_code=401, detail="Invalid bearer token")
-
     corrections = request.corrections
     if not corrections:
         raise HTTPException(status_code=400, detail="No corrections provided")
 
-    rows_to_insert: list[dict[str, str]] = []
-    for key, value in corrections.items():
-        if isinstance(value, str):
-            rows_to_insert.append({
-                "user_id": user_response.user.id,
-                "description": str(key),
-                "corrected_category": value,
-            })
-        elif isinstance(value, list):
-            for description in value:
-                rows_to_insert.append({
-                    "user_id": user_response.user.id,
-                    "description": str(description),
-                    "corrected_category": str(key),
-                })
-
-    if not rows_to_insert:
+    # One insert, so a feedback submission is stored entirely or not at
+    # all; training_corrections has no unique key to make retries of a
+    # partially stored submission safe.
+    rows = _correction_rows(corrections, user_id)
+    if not rows:
         raise HTTPException(status_code=400, detail="No valid corrections provided")
 
     try:
-        client.table("training_corrections").insert(rows_to_insert).execute()
+        await run_db(
+            lambda: client.table("training_corrections").insert(rows).execute()
+        )
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to store feedback")
 
     updated_categories = sorted(
-        {row["corrected_category"] for row in rows_to_insert if row["corrected_category"]}
+        {row["corrected_category"] for row in rows if row["corrected_category"]}
     )
     return {"status": "ok", "updated_categories": updated_categories}
 
@@ -138,13 +143,9 @@ async def submit_feedback(
 @router.post("/discover")
 async def discover_categories(
     request: DiscoverRequest,
-    client: Client = Depends(get_user_client),
+    user_id: str = Depends(get_current_user),
 ):
     """Discover novel categories using Generalized Category Discovery."""
-    user_response = client.auth.get_user()
-    if not user_response or not user_response.user:
-        raise HTTPException(status_code=401, detail="Invalid bearer token")
-
     if not request.descriptions:
         raise HTTPException(status_code=400, detail="No descriptions provided")
 
@@ -185,30 +186,28 @@ async def discover_categories(
 
 
 @router.get("/models")
-async def list_models(client: Client = Depends(get_user_client)):
+async def list_models(user_id: str = Depends(get_current_user)):
     """List available trained models for the user."""
     import os
 
-    user_response = client.auth.get_user()
-    if not user_response or not user_response.user:
-        raise HTTPException(status_code=401, detail="Invalid bearer token")
-
     checkpoint_dir = os.getenv("MODEL_CHECKPOINT_DIR", "/app/checkpoints")
-    user_dir = f"{checkpoint_dir}/{user_response.user.id}"
+    user_dir = f"{checkpoint_dir}/{user_id}"
 
-    if not os.path.exists(user_dir):
+    if not os.path.isdir(user_dir):
         return {"models": []}
 
+    # scandir reads names and file types in one pass; DirEntry caches its
+    # stat, so each checkpoint costs at most one stat call.
     models = []
-    for filename in os.listdir(user_dir):
-        if filename.endswith(".pt"):
-            filepath = os.path.join(user_dir, filename)
-            stat = os.stat(filepath)
-            models.append({
-                "name": filename,
-                "path": filepath,
-                "size_mb": round(stat.st_size / (1024 * 1024), 2),
-                "created_at": stat.st_mtime,
-            })
+    with os.scandir(user_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".pt") and entry.is_file():
+                stat = entry.stat()
+                models.append({
+                    "name": entry.name,
+                    "path": entry.path,
+                    "size_mb": round(stat.st_size / (1024 * 1024), 2),
+                    "created_at": stat.st_mtime,
+                })
 
     return {"models": sorted(models, key=lambda x: x["created_at"], reverse=True)}
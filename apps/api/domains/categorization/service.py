@@ -3,18 +3,62 @@
 Fixes:
 - ARCH-04: Classifier singleton via module-level caching (not per-request).
 - BUG-04: In-process batch classification (no N+1 Celery calls).
+
+Concurrent requests are coalesced by PredictionBatcher so that many small
+/classify calls share one predict_batch forward pass, and repeat
+descriptions are served from an in-process LRU of recent predictions.
 """
 
+import asyncio
 import os
+import sys
 import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import structlog
 
 logger = structlog.get_logger()
 
+BATCH_WINDOW_SECONDS = 0.005
+MAX_BATCH_SIZE = 64
+
+# Dynamic int8 quantization of the encoder on CPU. Opt-in ("1"): it changes
+# model outputs, and its accuracy impact has not been measured yet.
+QUANTIZE_ON_CPU = os.getenv("CLASSIFIER_QUANTIZE", "0") == "1"
+
 # Module-level singleton (thread-safe init)
 _classifier = None
 _classifier_lock = threading.Lock()
 
+# Recent predictions by description; transaction text repeats heavily
+PREDICTION_CACHE_SIZE = 100_000
+UNCATEGORIZED_RESULT = {"category": "Uncategorized", "confidence": 0.0}
+_prediction_cache: "OrderedDict[str, dict]" = OrderedDict()
+_prediction_cache_owner = None
+_prediction_cache_lock = threading.Lock()
+
+
+def _quantize_encoder(classifier) -> None:
+    """Swap the backend encoder's Linear layers for dynamic int8 versions.
+
+    Only applies to CPU backends — the transformer's Linear layers dominate
+    inference cost there and int8 weights quarter the memory traffic. The
+    hyperbolic projector and HypFFN head stay in float32 since they sit
+    near the Poincaré boundary and are tiny anyway.
+    """
+    backend = getattr(classifier, "backend", None)
+    model = getattr(backend, "model", None)
+    if model is None or backend.device.type != "cpu":
+        return
+
+    import torch
+
+    backend.model = torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+    logger.info("classifier_quantized", dtype="qint8")
+
 
 def get_classifier():
     """Get or create the HypCD classifier singleton.
@@ -29,7 +73,10 @@ def get_classifier():
             if _classifier is None:  # Double-checked locking
                 try:
                     from packages.categorization.hypcd import HypCDClassifier
-                    _classifier = HypCDClassifier()
+                    classifier = HypCDClassifier()
+                    if QUANTIZE_ON_CPU:
+                        _quantize_encoder(classifier)
+                    _classifier = classifier
                     logger.info("classifier_initialized", model="HypCDClassifier")
                 except Exception as e:
                     logger.error("classifier_init_failed", error=str(e))
@@ -37,6 +84,50 @@ def get_classifier():
     return _classifier
 
 
+def unload_classifier() -> None:
+    """Drop the classifier singleton and release its cached device memory.
+
+    PyTorch's caching allocator deliberately keeps freed GPU blocks for
+    reuse, so steady-state VRAM stays flat at the model's high-water mark
+    while the process serves requests — that is expected, not a leak. On
+    shutdown we hand those blocks back explicitly. The next
+    get_classifier() call reloads from disk.
+    """
+    global _classifier, _prediction_cache_owner
+    with _classifier_lock:
+        _classifier = None
+    with _prediction_cache_lock:
+        _prediction_cache.clear()
+        _prediction_cache_owner = None
+    _batcher.close()
+
+    # Only touch torch if something already imported it
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+        torch.cuda.ipc_collect()
+    logger.info("classifier_unloaded")
+
+
+def _prediction_result(pred) -> dict:
+    if isinstance(pred, dict):
+        return {
+            "category": str(pred.get("category", "Misc")),
+            "confidence": float(pred.get("confidence", 0.0)),
+        }
+    # Tuple format: (category, confidence, embedding)
+    return {"category": str(pred[0]), "confidence": float(pred[1])}
+
+
+def _cached_predictions(classifier) -> OrderedDict:
+    """The prediction cache, reset whenever the classifier instance changes."""
+    global _prediction_cache_owner
+    if _prediction_cache_owner is not classifier:
+        _prediction_cache.clear()
+        _prediction_cache_owner = classifier
+    return _prediction_cache
+
+
 def classify_batch_in_process(descriptions: list[str]) -> list[dict]:
     """Classify a batch of descriptions in-process.
 
@@ -45,28 +136,143 @@ def classify_batch_in_process(descriptions: list[str]) -> list[dict]:
     This version runs inference directly — it's fast PyTorch inference,
     no need for Celery.
 
+    Descriptions seen recently (compared after collapsing whitespace) are
+    answered from an LRU cache; only the distinct misses reach predict_batch.
+
     Returns list of {category, confidence} dicts.
     """
     classifier = get_classifier()
-    predictions = classifier.predict_batch(descriptions)
-
-    results = []
-    for pred in predictions:
-        if isinstance(pred, dict):
-            results.append({
-                "category": str(pred.get("category", "Misc")),
-                "confidence": float(pred.get("confidence", 0.0)),
-            })
-        else:
-            # Tuple format: (category, confidence, embedding)
-            results.append({
-                "category": str(pred[0]),
-                "confidence": float(pred[1]),
-            })
-    return results
+    keys = [" ".join(description.split()) for description in descriptions]
+
+    with _prediction_cache_lock:
+        cache = _cached_predictions(classifier)
+        found = {}
+        for key in keys:
+            if key in cache:
+                cache.move_to_end(key)
+                found[key] = cache[key]
+
+    pending: dict[str, str] = {}
+    for key, description in zip(keys, descriptions):
+        if key not in found:
+            pending.setdefault(key, description)
+
+    if pending:
+        predictions = classifier.predict_batch(list(pending.values()))
+        fresh = dict(zip(pending, map(_prediction_result, predictions)))
+        found.update(fresh)
+        with _prediction_cache_lock:
+            cache = _cached_predictions(classifier)
+            cache.update(fresh)
+            while len(cache) > PREDICTION_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    return [dict(found.get(key, UNCATEGORIZED_RESULT)) for key in keys]
 
 
 def classify_single_in_process(description: str) -> dict:
     """Classify a single description in-process."""
     results = classify_batch_in_process([description])
-    return results[0] if results else {"category": "Uncategorized", "confidence": 0.0}
+    return results[0] if results else dict(UNCATEGORIZED_RESULT)
+
+
+class PredictionBatcher:
+    """Coalesce concurrent classification requests into shared batches.
+
+    Each caller enqueues its descriptions and awaits a future. The queue is
+    flushed once it holds ``max_batch`` descriptions or ``window_seconds``
+    after the first item arrived, whichever comes first. Flushed batches run
+    on a single-worker executor, so inference never blocks the event loop
+    and the model only ever sees one forward pass at a time.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = MAX_BATCH_SIZE,
+        window_seconds: float = BATCH_WINDOW_SECONDS,
+    ):
+        self.max_batch = max_batch
+        self.window_seconds = window_seconds
+        self._pending: list[tuple[list[str], asyncio.Future]] = []
+        self._pending_size = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        # The event loop only holds tasks weakly; keep running batches alive.
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, descriptions: list[str]) -> list[dict]:
+        """Queue descriptions for the next batch and await their results."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((descriptions, future))
+        self._pending_size += len(descriptions)
+
+        if self._pending_size >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending, self._pending_size = self._pending, [], 0
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[list[str], asyncio.Future]]) -> None:
+        texts = [text for descriptions, _ in batch for text in descriptions]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="classify"
+            )
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self._executor, classify_batch_in_process, texts
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for descriptions, future in batch:
+            if not future.done():
+                future.set_result(results[offset:offset + len(descriptions)])
+            offset += len(descriptions)
+
+    def close(self) -> None:
+        """Shut down the inference executor; it is recreated on next use.
+
+        A pending flush timer belongs to the loop being shut down, so it is
+        cancelled along with the queued requests; otherwise later submits
+        would see a handle and never schedule their own flush.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending, self._pending_size = [], 0
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+_batcher = PredictionBatcher()
+
+
+async def classify_batch_queued(descriptions: list[str]) -> list[dict]:
+    """Classify descriptions through the shared cross-request batcher."""
+    return await _batcher.submit(descriptions)
+
+
+async def classify_single_queued(description: str) -> dict:
+    """Classify a single description through the shared batcher."""
+    results = await classify_batch_queued([description])
+    return results[0] if results else dict(UNCATEGORIZED_RESULT)
@@ -10,7 +10,7 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from apps.api.domains.categorization.router import router
-from apps.api.core.auth import get_user_client
+from apps.api.core.auth import get_current_user, get_user_client
 
 
 @pytest.fixture
@@ -35,6 +35,7 @@ def mock_user_client():
 @pytest.fixture
 def client(app, mock_user_client):
     app.dependency_overrides[get_user_client] = lambda: mock_user_client
+    app.dependency_overrides[get_current_user] = lambda: "test-user-123"
     c = TestClient(app)
     yield c
     app.dependency_overrides.clear()
@@ -115,3 +116,171 @@ class TestFeedback:
             "corrections": {},
         })
         assert response.status_code == 400
+
+    def test_feedback_stored_in_one_insert(self, client, mock_user_client):
+        table = mock_user_client.table.return_value
+
+        response = client.post("/api/v1/categorization/feedback", json={
+            "corrections": {"Food": ["Swiggy", "Zomato", "Dominos"], "Uber trip": "Transport"},
+        })
+
+        assert response.status_code == 200
+        assert response.json()["updated_categories"] == ["Food", "Transport"]
+        table.insert.assert_called_once()
+        rows = table.insert.call_args.args[0]
+        assert len(rows) == 4
+        assert rows[3] == {
+            "user_id": "test-user-123",
+            "description": "Uber trip",
+            "corrected_category": "Transport",
+        }
+
+
+class TestListModels:
+    """Checkpoint listing for the current user."""
+
+    def test_lists_only_checkpoint_files_newest_first(self, client, tmp_path, monkeypatch):
+        import os
+
+        monkeypatch.setenv("MODEL_CHECKPOINT_DIR", str(tmp_path))
+        user_dir = tmp_path / "test-user-123"
+        user_dir.mkdir()
+        (user_dir / "old.pt").write_bytes(b"x" * 1024)
+        (user_dir / "new.pt").write_bytes(b"x")
+        (user_dir / "notes.txt").write_text("ignore me")
+        (user_dir / "nested.pt").mkdir()
+        os.utime(user_dir / "old.pt", (0, 100))
+        os.utime(user_dir / "new.pt", (0, 200))
+
+        response = client.get("/api/v1/categorization/models")
+
+        assert response.status_code == 200
+        assert [m["name"] for m in response.json()["models"]] == ["new.pt", "old.pt"]
+
+    def test_missing_dir_returns_empty(self, client, tmp_path, monkeypatch):
+        monkeypatch.setenv("MODEL_CHECKPOINT_DIR", str(tmp_path))
+        response = client.get("/api/v1/categorization/models")
+        assert response.json() == {"models": []}
+
+
+class TestPredictionBatcher:
+    """Concurrent requests should share a single predict_batch call."""
+
+    def test_concurrent_submissions_coalesce(self, mock_classifier):
+        import asyncio
+
+        from apps.api.domains.categorization.service import PredictionBatcher
+
+        mock_classifier.predict_batch.side_effect = lambda texts: [
+            (text.upper(), 0.5, None) for text in texts
+        ]
+        batcher = PredictionBatcher(max_batch=64, window_seconds=0.01)
+
+        async def run():
+            return await asyncio.gather(
+                batcher.submit(["a"]),
+                batcher.submit(["b", "c"]),
+            )
+
+        first, second = asyncio.run(run())
+
+        mock_classifier.predict_batch.assert_called_once_with(["a", "b", "c"])
+        assert [r["category"] for r in first] == ["A"]
+        assert [r["category"] for r in second] == ["B", "C"]
+        assert batcher._tasks == set()  # finished batch tasks are released
+
+    def test_close_clears_flush_scheduled_on_a_closed_loop(self, mock_classifier):
+        import asyncio
+
+        from apps.api.domains.categorization.service import PredictionBatcher
+
+        mock_classifier.predict_batch.side_effect = lambda texts: [
+            ("Food", 0.5, None) for _ in texts
+        ]
+        batcher = PredictionBatcher(max_batch=64, window_seconds=60)
+
+        async def abandon():
+            task = asyncio.ensure_future(batcher.submit(["a"]))
+            await asyncio.sleep(0)  # queued, flush timer pending
+            task.cancel()
+
+        asyncio.run(abandon())
+        batcher.close()
+
+        batcher.window_seconds = 0.01
+        result = asyncio.run(asyncio.wait_for(batcher.submit(["b"]), timeout=5))
+
+        assert [r["category"] for r in result] == ["Food"]
+        mock_classifier.predict_batch.assert_called_once_with(["b"])
+        batcher.close()
+
+
+class TestPredictionCache:
+    """Repeat descriptions skip the classifier."""
+
+    def test_only_distinct_misses_reach_predict_batch(self, mock_classifier):
+        from apps.api.domains.categorization.service import classify_batch_in_process
+
+        mock_classifier.predict_batch.side_effect = lambda texts: [
+            (text.upper(), 0.5, None) for text in texts
+        ]
+
+        first = classify_batch_in_process(["uber trip", "swiggy", "uber  trip"])
+        second = classify_batch_in_process(["swiggy", "netflix"])
+
+        assert [r["category"] for r in first] == ["UBER TRIP", "SWIGGY", "UBER TRIP"]
+        assert [r["category"] for r in second] == ["SWIGGY", "NETFLIX"]
+        calls = [call.args[0] for call in mock_classifier.predict_batch.call_args_list]
+        assert calls == [["uber trip", "swiggy"], ["netflix"]]
+
+    def test_new_classifier_starts_with_empty_cache(self):
+        from apps.api.domains.categorization import service
+
+        old, new = MagicMock(), MagicMock()
+        old.predict_batch.return_value = [("Old", 0.5, None)]
+        new.predict_batch.return_value = [("New", 0.5, None)]
+
+        with patch.object(service, "get_classifier", lambda: old):
+            service.classify_batch_in_process(["rent"])
+        with patch.object(service, "get_classifier", lambda: new):
+            assert service.classify_batch_in_process(["rent"])[0]["category"] == "New"
+
+
+class TestQuantizeEncoder:
+    """CPU encoders get int8 Linear layers; other devices are left alone."""
+
+    def test_cpu_encoder_linear_layers_quantized(self):
+        torch = pytest.importorskip("torch")
+        from types import SimpleNamespace
+
+        from apps.api.domains.categorization.service import _quantize_encoder
+
+        backend = SimpleNamespace(
+            model=torch.nn.Sequential(torch.nn.Linear(8, 4)),
+            device=torch.device("cpu"),
+        )
+        _quantize_encoder(SimpleNamespace(backend=backend))
+
+        assert "quantized" in type(backend.model[0]).__module__
+
+    def test_non_cpu_encoder_untouched(self):
+        from types import SimpleNamespace
+
+        from apps.api.domains.categorization.service import _quantize_encoder
+
+        model = object()
+        backend = SimpleNamespace(model=model, device=SimpleNamespace(type="cuda"))
+        _quantize_encoder(SimpleNamespace(backend=backend))
+
+        assert backend.model is model
+
+
+class TestUnloadClassifier:
+    """Shutdown should drop the singleton so the next call reloads it."""
+
+    def test_unload_clears_singleton(self):
+        from apps.api.domains.categorization import service
+
+        with patch.object(service, "_classifier", MagicMock()):
+            service.unload_classifier()
+            assert service._classifier is None
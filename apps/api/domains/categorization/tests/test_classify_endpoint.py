@@ -1,11 +1,9 @@
 """Tests for POST /classify and POST /feedback endpoints."""
 import pytest
-from httpx import AsyncClient, ASGITransport
 from types import SimpleNamespace
 
 from apps.api.main import app
-from apps.api.core.auth import get_user_client
-import torch
+from apps.api.core.auth import get_current_user, get_user_client
 
 
 @pytest.fixture
@@ -21,13 +19,13 @@ def mock_classifier(monkeypatch):
             for text in texts:
                 upper = text.upper()
                 if "UBER" in upper:
-                    results.append(("Transport", 0.9, torch.zeros(1, 384)))
+                    results.append(("Transport", 0.9, None))
                 elif "ZOMATO" in upper or "SWIGGY" in upper:
-                    results.append(("Food", 0.85, torch.zeros(1, 384)))
+                    results.append(("Food", 0.85, None))
                 elif "NETFLIX" in upper:
-                    results.append(("Entertainment", 0.8, torch.zeros(1, 384)))
+                    results.append(("Entertainment", 0.8, None))
                 else:
-                    results.append(("Misc", 0.5, torch.zeros(1, 384)))
+                    results.append(("Misc", 0.5, None))
             return results
 
         def update_anchors(self, labeled_texts):
@@ -61,6 +59,7 @@ def mock_user_client():
             return MockTable()
 
     app.dependency_overrides[get_user_client] = lambda: MockClient()
+    app.dependency_overrides[get_current_user] = lambda: "test-user-id"
     yield
     app.dependency_overrides.clear()
 
@@ -68,17 +67,13 @@ def mock_user_client():
 # ─── /classify tests ───
 
 
-@pytest.mark.asyncio
-async def test_classify_returns_category_map(mock_classifier):
+def test_classify_returns_category_map(client, mock_classifier):
     """POST /classify with unique descriptions returns {description: category} map."""
     payload = {
         "descriptions": ["Uber trip to airport", "Zomato order #123", "Random store"]
     }
 
-    async with AsyncClient(
-        transport=ASGITransport(app=app), base_url="http://test"
-    ) as ac:
-        response = await ac.post("/api/v1/categorization/classify/batch", json=payload)
+    response = client.post("/api/v1/categorization/classify/batch", json=payload)
 
     assert response.status_code == 200
     data = response.json()
@@ -93,28 +88,20 @@ async def test_classify_returns_category_map(mock_classifier):
     assert preds[2]["category"] == "Misc"
 
 
-@pytest.mark.asyncio
-async def test_classify_empty_descriptions(mock_classifier):
+def test_classify_empty_descriptions(client, mock_classifier):
     """POST /classify with empty list returns 400."""
     payload = {"descriptions": []}
 
-    async with AsyncClient(
-        transport=ASGITransport(app=app), base_url="http://test"
-    ) as ac:
-        response = await ac.post("/api/v1/categorization/classify/batch", json=payload)
+    response = client.post("/api/v1/categorization/classify/batch", json=payload)
 
     assert response.status_code == 400
 
 
-@pytest.mark.asyncio
-async def test_classify_missing_descriptions_field(mock_classifier):
+def test_classify_missing_descriptions_field(client, mock_classifier):
     """POST /classify without descriptions field returns 400."""
     payload = {"texts": ["something"]}
 
-    async with AsyncClient(
-        transport=ASGITransport(app=app), base_url="http://test"
-    ) as ac:
-        response = await ac.post("/api/v1/categorization/classify/batch", json=payload)
+    response = client.post("/api/v1/categorization/classify/batch", json=payload)
 
     assert response.status_code == 422
 
@@ -122,17 +109,13 @@ async def test_classify_missing_descriptions_field(mock_classifier):
 # ─── /feedback tests ───
 
 
-@pytest.mark.asyncio
-async def test_feedback_updates_classifier(mock_classifier):
+def test_feedback_updates_classifier(client, mock_classifier):
     """POST /feedback accepts category correction payload."""
     payload = {
         "corrections": {"Food": ["Uber Eats delivery"], "Transport": ["Ola cab ride"]}
     }
 
-    async with AsyncClient(
-        transport=ASGITransport(app=app), base_url="http://test"
-    ) as ac:
-        response = await ac.post("/api/v1/categorization/feedback", json=payload)
+    response = client.post("/api/v1/categorization/feedback", json=payload)
 
     assert response.status_code == 200
     data = response.json()
@@ -141,14 +124,10 @@ async def test_feedback_updates_classifier(mock_classifier):
     assert sorted(data["updated_categories"]) == ["Food", "Transport"]
 
 
-@pytest.mark.asyncio
-async def test_feedback_empty_corrections(mock_classifier):
+def test_feedback_empty_corrections(client, mock_classifier):
     """POST /feedback with empty corrections returns 400."""
     payload = {"corrections": {}}
 
-    async with AsyncClient(
-        transport=ASGITransport(app=app), base_url="http://test"
-    ) as ac:
-        response = await ac.post("/api/v1/categorization/feedback", json=payload)
+    response = client.post("/api/v1/categorization/feedback", json=payload)
 
     assert response.status_code == 400
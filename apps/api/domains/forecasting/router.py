@@ -3,20 +3,31 @@
 Migrated from routers/forecast.py.
 Fixes BUG-07: Uses parse_file() instead of parse_csv_content() to
 preserve metadata columns.
+
+packages.forecasting pulls in pytorch_forecasting (and with it torch), so
+it is imported inside safe_to_spend rather than at module load — app
+start-up and the health probes don't pay for it. The daily averages
+themselves come from forecasting.service.recent_daily_means.
 """
 
-import hashlib
 import io
 from datetime import datetime, timedelta, timezone
 
-import pandas as pd
 import structlog
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from supabase import Client
 
-from apps.api.core.auth import get_user_client
-from packages.forecasting.dataset import TransactionLoader
-from packages.forecasting.inference import load_model, predict_with_tft
+from apps.api.core.auth import get_current_user, get_user_client
+from apps.api.core.db import run_db
+from apps.api.domains.forecasting.service import (
+    recent_daily_means,
+    transactions_frame,
+)
+from apps.api.domains.ingestion.service import (
+    hash_upload,
+    remember_upload,
+    upload_maybe_seen,
+)
 from packages.ingestion_engine.import_transactions import parse_file
 
 router = APIRouter(prefix="/forecast", tags=["forecast"])
@@ -27,11 +38,14 @@ logger = structlog.get_logger()
 async def forecast_predict(
     file: UploadFile = File(...),
     client: Client = Depends(get_user_client),
+    user_id: str = Depends(get_current_user),
 ):
     """Accept a CSV of transactions and return predicted spending.
 
     BUG-07 fix: Uses parse_file() (preserves metadata columns) instead
     of parse_csv_content() (drops them via _normalize_dataframe).
+
+    A previously registered file is rejected before any parsing happens.
     """
     if (
         file.content_type
@@ -40,12 +54,32 @@ async def forecast_predict(
     ):
         raise HTTPException(status_code=400, detail="Only CSV files are accepted.")
 
-    contents = await file.read()
-    file_hash = hashlib.sha256(contents).hexdigest()
+    _, file_hash = await hash_upload(file)
+
+    # Check duplicates before paying for parse + aggregation; the SELECT
+    # only runs when the Bloom filter says the hash was probably seen.
+    try:
+        maybe_seen = await run_db(upload_maybe_seen, client, user_id, file_hash)
+        existing = maybe_seen and await run_db(
+            lambda: client.table("uploaded_files")
+            .select("id")
+            .eq("user_id", user_id)
+            .eq("file_hash", file_hash)
+            .execute()
+        )
+        if existing and existing.data:
+            raise HTTPException(
+                status_code=400,
+                detail="This file has already been uploaded for forecasting.",
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.warning("duplicate_check_error", error=str(e))
 
     try:
         # BUG-07 fix: use parse_file instead of parse_csv_content
-        df = parse_file(contents, file.filename)
+        df = parse_file(file.file, file.filename)
     except Exception:
         raise HTTPException(status_code=400, detail="Failed to parse CSV")
 
@@ -53,22 +87,18 @@ async def forecast_predict(
         df = df.rename(columns={"transaction_date": "date"})
 
     try:
-        loader = TransactionLoader(df)
-        daily_df = loader.aggregate_daily()
+        _, avg_daily_spend, avg_daily_income = recent_daily_means(df)
     except Exception:
         raise HTTPException(status_code=400, detail="Failed to aggregate transactions")
 
     # Register upload hash
     try:
-        user_response = client.auth.get_user()
-        if not user_response or not user_response.user:
-            raise HTTPException(status_code=401, detail="Invalid bearer token")
-        client.table("uploaded_files").insert({
-            "user_id": user_response.user.id,
+        await run_db(lambda: client.table("uploaded_files").insert({
+            "user_id": user_id,
             "file_hash": file_hash,
             "filename": file.filename,
             "upload_type": "forecast",
-        }).execute()
+        }).execute())
     except Exception as e:
         if "duplicate key" in str(e) or "23505" in str(e):
             raise HTTPException(
@@ -76,25 +106,19 @@ async def forecast_predict(
                 detail="This file has already been uploaded for forecasting.",
             )
         raise HTTPException(status_code=500, detail="Failed to register upload")
+    await run_db(remember_upload, user_id, file_hash)
 
     # Statistical forecast
     horizon = 7
-    recent = daily_df.tail(min(30, len(daily_df)))
-    avg_daily_spend = (
-        float(recent["daily_spend"].mean()) if "daily_spend" in recent.columns else 0.0
-    )
-    avg_daily_income = (
-        float(recent["daily_income"].mean()) if "daily_income" in recent.columns else 0.0
-    )
 
+    # The rolling average is flat, so every day shares the same values
+    daily_prediction = {
+        "predicted_spend": round(avg_daily_spend, 2),
+        "predicted_income": round(avg_daily_income, 2),
+        "predicted_net": round(avg_daily_income - avg_daily_spend, 2),
+    }
     predictions = [
-        {
-            "day_offset": day,
-            "predicted_spend": round(avg_daily_spend, 2),
-            "predicted_income": round(avg_daily_income, 2),
-            "predicted_net": round(avg_daily_income - avg_daily_spend, 2),
-        }
-        for day in range(1, horizon + 1)
+        {"day_offset": day, **daily_prediction} for day in range(1, horizon + 1)
     ]
 
     return {
@@ -106,15 +130,18 @@ async def forecast_predict(
 
 
 @router.get("/safe-to-spend")
-async def safe_to_spend(client: Client = Depends(get_user_client)):
+async def safe_to_spend(
+    client: Client = Depends(get_user_client),
+    user_id: str = Depends(get_current_user),
+):
     """Returns predicted safe-to-spend amount for the authenticated user."""
     horizon = 7
     lookback_days = 90
 
     try:
         cutoff = (datetime.now(timezone.utc) - timedelta(days=lookback_days)).isoformat()
-        response = (
-            client.table("transactions")
+        response = await run_db(
+            lambda: client.table("transactions")
             .select("transaction_date, amount, status")
             .gte("transaction_date", cutoff)
             .order("transaction_date", desc=False)
@@ -134,54 +161,46 @@ async def safe_to_spend(client: Client = Depends(get_user_client)):
             "note": "No transactions found in the last 90 days.",
         }
 
-    df = pd.DataFrame(rows)
-    df = df.rename(columns={"transaction_date": "date"})
-    df["amount"] = pd.to_numeric(df["amount"], errors="coerce").fillna(0)
+    df = transactions_frame(rows)
 
     try:
-        loader = TransactionLoader(df)
-        daily_df = loader.aggregate_daily()
+        days_of_data, avg_daily_spend, avg_daily_income = recent_daily_means(df)
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to aggregate transactions")
 
-    days_of_data = len(daily_df)
     confidence = round(min(days_of_data / lookback_days, 1.0), 2)
-    recent = daily_df.tail(min(30, len(daily_df)))
-
-    user_resp = client.auth.get_user()
-    user_id = user_resp.user.id if user_resp and user_resp.user else None
 
     model_name = "statistical_mvp"
     model_note = f"Based on {days_of_data} days of transaction history."
 
-    avg_daily_income = (
-        float(recent["daily_income"].mean()) if "daily_income" in recent.columns else 0.0
-    )
-    avg_daily_spend = (
-        float(recent["daily_spend"].mean()) if "daily_spend" in recent.columns else 0.0
-    )
     safe_amount = round((avg_daily_income - avg_daily_spend) * horizon, 2)
     forecast_breakdown = []
 
-    if user_id:
-        try:
-            tft_model = load_model(client, user_id)
-            if tft_model and len(daily_df) >= 60:
-                pred_data = predict_with_tft(tft_model, df, horizon=horizon)
-                if "forecast" in pred_data:
-                    forecast = pred_data["forecast"]
-                    total_predicted_spend_p90 = sum(
-                        day.get("p90", 0) for day in forecast
-                    )
-                    total_predicted_income = avg_daily_income * horizon
-                    safe_amount = round(
-                        total_predicted_income - total_predicted_spend_p90, 2
-                    )
-                    model_name = "tft_v1"
-                    model_note = "AI prediction (TFT) for spending, statistical avg for income."
-                    forecast_breakdown = forecast
-        except Exception as e:
-            logger.warning("tft_inference_failed", error=str(e))
+    try:
+        # Inside the try: without pytorch_forecasting installed the
+        # ImportError falls back to the statistical estimate like any
+        # other TFT failure.
+        from packages.forecasting.inference import load_model, predict_with_tft
+
+        tft_model = await run_db(load_model, client, user_id)
+        if tft_model and days_of_data >= 60:
+            pred_data = await run_db(
+                lambda: predict_with_tft(tft_model, df, horizon=horizon)
+            )
+            if "forecast" in pred_data:
+                forecast = pred_data["forecast"]
+                total_predicted_spend_p90 = sum(
+                    day.get("p90", 0) for day in forecast
+                )
+                total_predicted_income = avg_daily_income * horizon
+                safe_amount = round(
+                    total_predicted_income - total_predicted_spend_p90, 2
+                )
+                model_name = "tft_v1"
+                model_note = "AI prediction (TFT) for spending, statistical avg for income."
+                forecast_breakdown = forecast
+    except Exception as e:
+        logger.warning("tft_inference_failed", error=str(e))
 
     return {
         "safe_amount": safe_amount,
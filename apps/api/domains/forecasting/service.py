@@ -1 +1,76 @@
 """Forecasting service — prediction, safe-to-spend calculation."""
+
+import numpy as np
+import pandas as pd
+
+
+def transactions_frame(rows: list[dict]) -> pd.DataFrame:
+    """Build the (date, amount) frame TransactionLoader needs from DB rows.
+
+    Extracts only the two columns aggregation uses instead of running the
+    list-of-dicts DataFrame constructor, which infers a dtype for every
+    field of every row. Non-numeric amounts are coerced to 0.
+
+    PostgREST returns amounts as numbers or numeric strings, which NumPy
+    converts in one C-level cast; pd.to_numeric's per-cell coercion only
+    runs when some value is not a number at all.
+    """
+    raw_amounts = [row.get("amount") for row in rows]
+    try:
+        amounts = np.array(raw_amounts, dtype=np.float64)
+    except (TypeError, ValueError):
+        amounts = pd.to_numeric(raw_amounts, errors="coerce").astype(np.float64)
+    amounts[np.isnan(amounts)] = 0.0
+
+    return pd.DataFrame({
+        "date": [row.get("transaction_date") for row in rows],
+        "amount": amounts,
+    })
+
+
+def recent_daily_means(df: pd.DataFrame, window: int = 30) -> tuple[int, float, float]:
+    """Average daily spend and income over the last ``window`` days.
+
+    Single-pass equivalent of ``TransactionLoader(df).aggregate_daily()``
+    followed by ``.tail(window)`` and a mean of each column: amounts are
+    binned per day with np.bincount and reduced straight to the window,
+    without building the resampled frame or its closing-balance column.
+    Like aggregate_daily(), a day counts from the first to the last day
+    with income, or with spend; zero amounts and missing dates are ignored.
+
+    Returns:
+        (days in the aggregated range, avg_daily_spend, avg_daily_income),
+        with 0.0 averages when there are no non-zero amounts.
+    """
+    dates = pd.to_datetime(df["date"])
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    days = dates.to_numpy(dtype="datetime64[D]")
+    amounts = df["amount"].to_numpy(dtype=np.float64)
+
+    valid = ~np.isnat(days)
+    days = days[valid].astype(np.int64)
+    amounts = amounts[valid]
+    income = amounts > 0
+    spend = amounts < 0
+    active = income | spend
+    if not active.any():
+        return 0, 0.0, 0.0
+
+    first_day = days[active].min()
+    offsets = days - first_day
+    size = int(offsets[active].max()) + 1
+
+    in_range = np.zeros(size, dtype=bool)
+    for mask in (income, spend):
+        if mask.any():
+            in_range[offsets[mask].min():offsets[mask].max() + 1] = True
+
+    daily_income = np.bincount(offsets[income], weights=amounts[income], minlength=size)
+    daily_spend = np.bincount(offsets[spend], weights=-amounts[spend], minlength=size)
+    recent = in_range.nonzero()[0][-window:]
+    return (
+        int(in_range.sum()),
+        float(daily_spend[recent].mean()),
+        float(daily_income[recent].mean()),
+    )
@@ -6,8 +6,55 @@ paths now produce identical fingerprints for the same transaction.
 """
 
 import hashlib
+import os
+from functools import lru_cache
 from typing import Optional
 
+import numpy as np
+import pandas as pd
+import structlog
+from fastapi import UploadFile
+from supabase import Client
+
+from apps.api.core.cache import get_redis
+from apps.api.core.errors import AppError
+
+logger = structlog.get_logger()
+
+UPLOAD_CHUNK_BYTES = 1 << 20
+
+# Upload size limit shared by the ingestion and training endpoints
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+# /proc/cpuinfo flags advertising SHA-256 instructions: x86 SHA-NI, ARMv8 SHA2
+SHA_CPU_FLAGS = {"sha_ni", "sha2"}
+
+
+def cpu_has_sha_extensions(cpuinfo_path: str = "/proc/cpuinfo") -> Optional[bool]:
+    """Whether the CPU advertises SHA-256 instructions OpenSSL can use.
+
+    Returns None when cpuinfo is unavailable (non-Linux hosts).
+    """
+    try:
+        with open(cpuinfo_path) as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name.strip() in ("flags", "Features"):
+                    return not SHA_CPU_FLAGS.isdisjoint(value.split())
+    except OSError:
+        return None
+    return False
+
+
+@lru_cache(maxsize=2048)
+def _normalize_field(value: str) -> str:
+    """Trim and uppercase a text field.
+
+    Cached because merchants, payment methods and descriptions repeat
+    heavily across a statement (recurring subscriptions, same shops).
+    """
+    return value.strip().upper()
+
 
 def generate_fingerprint(
     date: str,
@@ -39,13 +86,253 @@ def generate_fingerprint(
     """
     normalized_date = date[:19]
     normalized_amount = f"{amount:.2f}"
-    normalized_merchant = merchant.strip().upper()
-    normalized_description = description.strip().upper()
-    normalized_payment = payment_method.strip().upper()
-    normalized_reference = reference.strip().upper()
+    normalized_merchant = _normalize_field(merchant)
+    normalized_description = _normalize_field(description)
+    normalized_payment = _normalize_field(payment_method)
+    normalized_reference = _normalize_field(reference)
 
     raw = (
         f"{normalized_date}|{normalized_amount}|{normalized_merchant}"
         f"|{normalized_description}|{normalized_payment}|{normalized_reference}"
     )
     return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def generate_fingerprints_from_columns(
+    dates: pd.Series,
+    amounts: pd.Series,
+    merchants: pd.Series,
+    descriptions: Optional[pd.Series] = None,
+    payment_methods: Optional[pd.Series] = None,
+    references: Optional[pd.Series] = None,
+) -> list[str]:
+    """Batch generate_fingerprint() over aligned column Series.
+
+    Produces exactly what calling generate_fingerprint() row by row would,
+    but the normalization runs column-wise and every payload is joined and
+    encoded up front, so the per-row cost is a single sha256 digest.
+    Optional columns that are not supplied hash as blanks.
+
+    Returns:
+        List of 64-character hex digests, aligned with the input rows.
+    """
+    if dates.empty:
+        return []
+
+    blank = pd.Series("", index=dates.index, dtype=object)
+
+    def normalized(column: Optional[pd.Series]) -> pd.Series:
+        return blank if column is None else column.map(str).map(_normalize_field)
+
+    fields = [
+        dates.map(str).str[:19],
+        amounts.astype(float).map("{:.2f}".format),
+        normalized(merchants),
+        normalized(descriptions),
+        normalized(payment_methods),
+        normalized(references),
+    ]
+    # Join the per-row fields in one comprehension over plain lists; every
+    # field is already a str, so Series.str.cat's per-element NaN handling
+    # and the separate Series.str.encode pass are pure overhead.
+    encoded = [
+        "|".join(row).encode("utf-8")
+        for row in zip(*(field.tolist() for field in fields))
+    ]
+
+    # Statements repeat byte-identical rows (recurring charges, same-day
+    # coffees); hash each distinct payload once. map() calls the C
+    # constructor without a Python-level call per row — each message is
+    # under one SHA block, so dispatch overhead dominates.
+    unique = dict.fromkeys(encoded)
+    if len(unique) == len(encoded):
+        return [digest.hexdigest() for digest in map(hashlib.sha256, encoded)]
+
+    digests = {
+        payload: digest.hexdigest()
+        for payload, digest in zip(unique, map(hashlib.sha256, unique))
+    }
+    return list(map(digests.__getitem__, encoded))
+
+
+def generate_fingerprints(df: pd.DataFrame) -> list[str]:
+    """Fingerprint every row of a parsed transactions DataFrame in one pass.
+
+    Absent columns are treated like generate_fingerprint()'s defaults.
+
+    Returns:
+        List of 64-character hex digests, aligned with ``df`` rows.
+    """
+    if df.empty:
+        return []
+
+    blank = pd.Series("", index=df.index, dtype=object)
+    return generate_fingerprints_from_columns(
+        dates=df["date"] if "date" in df.columns else blank,
+        amounts=df["amount"] if "amount" in df.columns else pd.Series(0.0, index=df.index),
+        merchants=df["merchant"] if "merchant" in df.columns else blank,
+        descriptions=df.get("description"),
+        payment_methods=df.get("payment_method"),
+        references=df.get("reference"),
+    )
+
+
+def drop_missing_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """Drop rows whose date is missing or blank.
+
+    A datetime64 column only needs dropna. Otherwise each date is
+    stringified and stripped in one pass over a plain list, rather than
+    through the astype(str).str.strip() Series chain.
+    """
+    df = df.dropna(subset=["date"])
+    dates = df["date"]
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return df
+    stripped = np.fromiter(
+        map(str.strip, map(str, dates.tolist())), dtype=object, count=len(dates)
+    )
+    return df[stripped.astype(bool)]
+
+
+def replace_non_finite(df: pd.DataFrame) -> pd.DataFrame:
+    """Replace NaN/inf with None for JSON safety, one column at a time.
+
+    Equivalent to ``df.replace([np.nan, np.inf, -np.inf], None)`` but only
+    touches columns that actually hold missing or infinite values: numeric
+    columns are masked with a vectorized isfinite check, other columns with
+    isna, and clean columns keep their dtype.
+    """
+    replaced = {}
+    for col, values in df.items():
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            keep = np.isfinite(values.to_numpy(dtype=np.float64))
+        else:
+            keep = values.notna().to_numpy()
+        if not keep.all():
+            replaced[col] = values.astype(object).where(keep, None)
+    return df.assign(**replaced) if replaced else df
+
+
+def _upload_too_large(max_bytes: int) -> AppError:
+    return AppError(
+        f"File too large (max {max_bytes // (1024 * 1024)}MB)", status_code=413
+    )
+
+
+def check_upload_size(file: UploadFile, max_bytes: int) -> None:
+    """Reject an upload larger than max_bytes without reading it.
+
+    For endpoints that need the size limit but not the content hash.
+    Starlette records the size while spooling a multipart upload; when it
+    is missing, the spooled file is measured by seeking to its end.
+
+    Raises:
+        AppError: 413 when the upload exceeds max_bytes.
+    """
+    size = file.size
+    if size is None:
+        size = file.file.seek(0, os.SEEK_END)
+        file.file.seek(0)
+    if size > max_bytes:
+        raise _upload_too_large(max_bytes)
+
+
+async def hash_upload(
+    file: UploadFile, max_bytes: Optional[int] = None
+) -> tuple[int, str]:
+    """Hash an upload in 1 MiB chunks, then rewind it for parsing.
+
+    The chunks are not kept: parse_file reads the upload's spooled temp
+    file in place afterwards, so the payload is never also held as one
+    bytes object. With max_bytes set, reading stops as soon as the limit
+    is crossed.
+
+    Returns:
+        The upload's size in bytes and its hex SHA256.
+
+    Raises:
+        AppError: 413 when the upload exceeds max_bytes.
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        if max_bytes is not None and size > max_bytes:
+            raise _upload_too_large(max_bytes)
+        hasher.update(chunk)
+    await file.seek(0)
+    return size, hasher.hexdigest()
+
+
+# Per-user Bloom filter of uploaded_files hashes (Redis 8 / RedisBloom).
+# A negative answer is definitive once the filter has been seeded, so the
+# duplicate-check SELECT is only issued for "probably seen" hashes.
+UPLOAD_FILTER_KEY = "uploads:bf:{user_id}"
+UPLOAD_FILTER_CAPACITY = 10_000
+UPLOAD_FILTER_ERROR_RATE = 0.001
+UPLOAD_FILTER_PAGE_ROWS = 1000
+
+
+def _seed_upload_filter(r, client: Client, key: str, user_id: str) -> None:
+    """Create the user's filter from every hash already in uploaded_files."""
+    hashes: list[str] = []
+    start = 0
+    while True:
+        page = (
+            client.table("uploaded_files")
+            .select("file_hash")
+            .eq("user_id", user_id)
+            .range(start, start + UPLOAD_FILTER_PAGE_ROWS - 1)
+            .execute()
+        ).data or []
+        hashes.extend(row["file_hash"] for row in page)
+        if len(page) < UPLOAD_FILTER_PAGE_ROWS:
+            break
+        start += UPLOAD_FILTER_PAGE_ROWS
+
+    if hashes:
+        r.execute_command(
+            "BF.INSERT", key,
+            "CAPACITY", UPLOAD_FILTER_CAPACITY,
+            "ERROR", UPLOAD_FILTER_ERROR_RATE,
+            "ITEMS", *hashes,
+        )
+    else:
+        try:
+            r.execute_command(
+                "BF.RESERVE", key, UPLOAD_FILTER_ERROR_RATE, UPLOAD_FILTER_CAPACITY
+            )
+        except Exception:
+            # Created concurrently by another request
+            pass
+
+
+def upload_maybe_seen(client: Client, user_id: str, file_hash: str) -> bool:
+    """Return False only if this user has definitely not uploaded file_hash.
+
+    Blocking (Redis + Supabase). The first call per user seeds the filter
+    from uploaded_files. Any Redis failure, including a server without
+    Bloom filter support, answers True so callers fall back to the SELECT.
+    """
+    key = UPLOAD_FILTER_KEY.format(user_id=user_id)
+    try:
+        r = get_redis()
+        if not r.exists(key):
+            _seed_upload_filter(r, client, key, user_id)
+        return bool(r.execute_command("BF.EXISTS", key, file_hash))
+    except Exception as e:
+        logger.warning("upload_filter_unavailable", error=str(e))
+        return True
+
+
+def remember_upload(user_id: str, file_hash: str) -> None:
+    """Record a registered upload in the user's filter, if it exists yet.
+
+    NOCREATE leaves unseeded users alone; their first check seeds the
+    filter from uploaded_files, which will include this row. Blocking.
+    """
+    key = UPLOAD_FILTER_KEY.format(user_id=user_id)
+    try:
+        get_redis().execute_command("BF.INSERT", key, "NOCREATE", "ITEMS", file_hash)
+    except Exception as e:
+        logger.debug("upload_filter_add_skipped", error=str(e))
@@ -109,3 +109,167 @@ class TestFingerprint:
             reference="",
         )
         assert fp_full == fp_tz
+
+
+class TestBatchFingerprint:
+    """generate_fingerprints must agree with the per-row generate_fingerprint."""
+
+    def test_batch_matches_scalar(self):
+        import pandas as pd
+
+        from apps.api.domains.ingestion.service import generate_fingerprints
+
+        df = pd.DataFrame({
+            "date": ["2026-01-15T10:30:00+05:30", "2026-01-16"],
+            "amount": [50, -12.345],
+            "merchant": [" starbucks ", "Uber"],
+            "description": ["Coffee", None],
+            "payment_method": ["card", ""],
+        })
+
+        expected = [
+            generate_fingerprint(
+                date=str(row["date"]),
+                amount=float(row["amount"]),
+                merchant=str(row["merchant"]),
+                description=str(row["description"]),
+                payment_method=str(row["payment_method"]),
+                reference="",
+            )
+            for _, row in df.iterrows()
+        ]
+        assert generate_fingerprints(df) == expected
+
+    def test_batch_empty_frame(self):
+        import pandas as pd
+
+        from apps.api.domains.ingestion.service import generate_fingerprints
+
+        assert generate_fingerprints(pd.DataFrame()) == []
+
+
+class TestHashUpload:
+    """hash_upload hashes the file incrementally and rewinds it."""
+
+    def test_returns_size_and_sha256_and_rewinds(self, monkeypatch):
+        import asyncio
+        import hashlib
+        import io
+
+        from fastapi import UploadFile
+
+        from apps.api.domains.ingestion import service
+
+        monkeypatch.setattr(service, "UPLOAD_CHUNK_BYTES", 4)
+        payload = b"date,amount\n2026-01-01,5\n"
+        upload = UploadFile(file=io.BytesIO(payload), filename="t.csv")
+
+        size, file_hash = asyncio.run(service.hash_upload(upload))
+
+        assert size == len(payload)
+        assert file_hash == hashlib.sha256(payload).hexdigest()
+        assert upload.file.read() == payload
+
+    def test_stops_reading_past_max_bytes(self, monkeypatch):
+        import asyncio
+        import io
+
+        from fastapi import UploadFile
+
+        from apps.api.core.errors import AppError
+        from apps.api.domains.ingestion import service
+
+        monkeypatch.setattr(service, "UPLOAD_CHUNK_BYTES", 4)
+        buffer = io.BytesIO(b"x" * 64)
+        upload = UploadFile(file=buffer, filename="t.csv")
+
+        with pytest.raises(AppError) as exc:
+            asyncio.run(service.hash_upload(upload, max_bytes=10))
+
+        assert exc.value.status_code == 413
+        assert buffer.tell() == 12
+
+
+class TestCheckUploadSize:
+    """check_upload_size enforces the limit without reading the upload."""
+
+    def test_uses_recorded_size_without_reading(self):
+        import io
+
+        from fastapi import UploadFile
+
+        from apps.api.core.errors import AppError
+        from apps.api.domains.ingestion.service import check_upload_size
+
+        buffer = io.BytesIO(b"x" * 4)
+        upload = UploadFile(file=buffer, filename="t.csv", size=64)
+
+        with pytest.raises(AppError) as exc:
+            check_upload_size(upload, max_bytes=10)
+
+        assert exc.value.status_code == 413
+        assert buffer.tell() == 0
+
+    def test_measures_file_when_size_unknown(self):
+        import io
+
+        from fastapi import UploadFile
+
+        from apps.api.core.errors import AppError
+        from apps.api.domains.ingestion.service import check_upload_size
+
+        small = UploadFile(file=io.BytesIO(b"x" * 10), filename="t.csv")
+        check_upload_size(small, max_bytes=10)
+        assert small.file.tell() == 0
+
+        large = UploadFile(file=io.BytesIO(b"x" * 11), filename="t.csv")
+        with pytest.raises(AppError):
+            check_upload_size(large, max_bytes=10)
+
+
+class TestBatchFingerprintDuplicates:
+    """Identical rows must still get (identical) fingerprints in order."""
+
+    def test_duplicate_rows(self):
+        import pandas as pd
+
+        from apps.api.domains.ingestion.service import generate_fingerprints
+
+        df = pd.DataFrame({
+            "date": ["2026-01-15", "2026-01-15", "2026-01-16"],
+            "amount": [4.5, 4.5, 4.5],
+            "merchant": ["Starbucks", "Starbucks", "Starbucks"],
+        })
+        fps = generate_fingerprints(df)
+
+        assert len(fps) == 3
+        assert fps[0] == fps[1] != fps[2]
+        assert fps[2] == generate_fingerprint(
+            date="2026-01-16", amount=4.5, merchant="Starbucks"
+        )
+
+
+class TestCpuShaExtensions:
+    """cpuinfo flag detection for hardware SHA-256."""
+
+    def test_detects_x86_sha_ni(self, tmp_path):
+        from apps.api.domains.ingestion.service import cpu_has_sha_extensions
+
+        cpuinfo = tmp_path / "cpuinfo"
+        cpuinfo.write_text("processor\t: 0\nflags\t\t: fpu sse2 avx2 sha_ni\n")
+        assert cpu_has_sha_extensions(str(cpuinfo)) is True
+
+    def test_detects_arm_sha2(self, tmp_path):
+        from apps.api.domains.ingestion.service import cpu_has_sha_extensions
+
+        cpuinfo = tmp_path / "cpuinfo"
+        cpuinfo.write_text("processor\t: 0\nFeatures\t: fp asimd aes sha1 sha2\n")
+        assert cpu_has_sha_extensions(str(cpuinfo)) is True
+
+    def test_missing_flag_and_missing_file(self, tmp_path):
+        from apps.api.domains.ingestion.service import cpu_has_sha_extensions
+
+        cpuinfo = tmp_path / "cpuinfo"
+        cpuinfo.write_text("flags\t\t: fpu sse2 avx2\n")
+        assert cpu_has_sha_extensions(str(cpuinfo)) is False
+        assert cpu_has_sha_extensions(str(tmp_path / "absent")) is None
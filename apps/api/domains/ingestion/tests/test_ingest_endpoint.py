@@ -4,14 +4,12 @@ Migrated from apps/api/tests/test_ingestion.py to test the new domain router.
 """
 
 import io
-import torch
 import pytest
-from unittest.mock import MagicMock
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from apps.api.domains.ingestion.router import router
-from apps.api.core.auth import get_user_client
+from apps.api.core.auth import get_current_user
 
 
 @pytest.fixture
@@ -27,7 +25,7 @@ def mock_classifier(monkeypatch):
 
     class MockClassifier:
         def predict_batch(self, texts):
-            return [("Food", 0.8, torch.zeros(1, 384)) for _ in texts]
+            return [("Food", 0.8, None) for _ in texts]
 
     monkeypatch.setattr(
         "apps.api.domains.ingestion.router.get_classifier",
@@ -37,17 +35,8 @@ def mock_classifier(monkeypatch):
 
 
 @pytest.fixture
-def mock_user_client():
-    mock_client = MagicMock()
-    mock_user = MagicMock()
-    mock_user.id = "test-user-id"
-    mock_client.auth.get_user.return_value = MagicMock(user=mock_user)
-    return mock_client
-
-
-@pytest.fixture
-def client(app, mock_user_client):
-    app.dependency_overrides[get_user_client] = lambda: mock_user_client
+def client(app):
+    app.dependency_overrides[get_current_user] = lambda: "test-user-id"
     c = TestClient(app)
     yield c
     app.dependency_overrides.clear()
@@ -1,12 +1,10 @@
 """Tests for the CSV ingestion endpoint."""
 import io
-import torch
 import pytest
-from types import SimpleNamespace
 from fastapi.testclient import TestClient
 
 from apps.api.main import app
-from apps.api.core.auth import get_user_client
+from apps.api.core.auth import get_current_user
 
 client = TestClient(app)
 
@@ -15,16 +13,8 @@ client = TestClient(app)
 
 
 @pytest.fixture(autouse=True)
-def mock_user_client():
-    class MockClient:
-        def __init__(self):
-            self.auth = SimpleNamespace(
-                get_user=lambda: SimpleNamespace(
-                    user=SimpleNamespace(id="test-user-id")
-                )
-            )
-
-    app.dependency_overrides[get_user_client] = lambda: MockClient()
+def mock_current_user():
+    app.dependency_overrides[get_current_user] = lambda: "test-user-id"
     yield
     app.dependency_overrides.clear()
 
@@ -93,3 +83,37 @@ def test_ingest_csv_rejects_non_csv():
         files={"file": ("photo.jpg", file, "image/jpeg")},
     )
     assert response.status_code == 400
+
+
+def test_replace_non_finite_matches_replace():
+    """Same values as df.replace([nan, inf, -inf], None); clean columns keep dtype."""
+    import numpy as np
+    import pandas as pd
+
+    from apps.api.domains.ingestion.service import replace_non_finite
+
+    df = pd.DataFrame({
+        "description": ["a", np.nan, "c"],
+        "amount": [1.5, np.inf, np.nan],
+        "balance": [10.0, 20.0, 30.0],
+    })
+    expected = df.replace([np.nan, np.inf, -np.inf], None)
+
+    result = replace_non_finite(df)
+
+    for col in df.columns:
+        assert result[col].tolist() == expected[col].tolist()
+    assert result["balance"].dtype == np.float64
+
+
+def test_drop_missing_dates():
+    """Missing and whitespace-only dates are dropped; datetime columns only need dropna."""
+    import pandas as pd
+
+    from apps.api.domains.ingestion.service import drop_missing_dates
+
+    df = pd.DataFrame({"date": ["2026-01-01", None, "  ", ""], "amount": [1.0, 2.0, 3.0, 4.0]})
+    assert drop_missing_dates(df)["amount"].tolist() == [1.0]
+
+    timestamps = pd.DataFrame({"date": pd.to_datetime(["2026-01-01", None]), "amount": [1.0, 2.0]})
+    assert drop_missing_dates(timestamps)["amount"].tolist() == [1.0]
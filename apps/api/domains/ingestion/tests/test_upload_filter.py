@@ -0,0 +1,75 @@
+"""Tests for the per-user uploaded-file Bloom filter."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from apps.api.domains.ingestion import service
+
+
+class FakeBloomRedis:
+    """In-memory stand-in for the BF.* commands used by the service."""
+
+    def __init__(self):
+        self.filters: dict[str, set[str]] = {}
+
+    def exists(self, key):
+        return int(key in self.filters)
+
+    def execute_command(self, command, key, *args):
+        if command == "BF.RESERVE":
+            if key in self.filters:
+                raise RuntimeError("ERR item exists")
+            self.filters[key] = set()
+        elif command == "BF.INSERT":
+            if "NOCREATE" in args and key not in self.filters:
+                raise RuntimeError("ERR not found")
+            items = args[args.index("ITEMS") + 1:]
+            self.filters.setdefault(key, set()).update(items)
+        elif command == "BF.EXISTS":
+            return int(args[0] in self.filters.get(key, set()))
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeBloomRedis()
+    monkeypatch.setattr(service, "get_redis", lambda: fake)
+    return fake
+
+
+def _client_with_hashes(hashes):
+    client = MagicMock()
+    query = client.table.return_value.select.return_value.eq.return_value
+    query.range.return_value.execute.return_value = SimpleNamespace(
+        data=[{"file_hash": h} for h in hashes]
+    )
+    return client
+
+
+class TestUploadFilter:
+    def test_seeds_once_from_uploaded_files(self, fake_redis):
+        client = _client_with_hashes(["old-hash"])
+
+        assert service.upload_maybe_seen(client, "u1", "old-hash") is True
+        assert service.upload_maybe_seen(client, "u1", "new-hash") is False
+        assert client.table.call_count == 1
+
+    def test_remembered_upload_is_seen(self, fake_redis):
+        client = _client_with_hashes([])
+
+        assert service.upload_maybe_seen(client, "u1", "h1") is False
+        service.remember_upload("u1", "h1")
+        assert service.upload_maybe_seen(client, "u1", "h1") is True
+
+    def test_remember_does_not_create_unseeded_filter(self, fake_redis):
+        service.remember_upload("u1", "h1")
+        assert fake_redis.filters == {}
+
+    def test_redis_failure_falls_back_to_select(self, monkeypatch):
+        def unavailable():
+            raise ConnectionError("redis down")
+
+        monkeypatch.setattr(service, "get_redis", unavailable)
+        assert service.upload_maybe_seen(MagicMock(), "u1", "h1") is True
+        service.remember_upload("u1", "h1")
@@ -4,27 +4,42 @@ Migrated from routers/training.py. Uses new unified fingerprint and
 core auth module.
 """
 
-import hashlib
+import asyncio
 
 import pandas as pd
 import structlog
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from supabase import Client
-from typing import Optional
-
-from apps.api.core.auth import get_user_client
-from apps.api.domains.ingestion.service import generate_fingerprint
+from typing import Mapping, Optional
+
+from apps.api.core.auth import get_current_user, get_user_client
+from apps.api.core.db import run_db
+from apps.api.domains.ingestion.service import (
+    MAX_UPLOAD_BYTES,
+    generate_fingerprint,
+    generate_fingerprints_from_columns,
+    hash_upload,
+    remember_upload,
+    upload_maybe_seen,
+)
 from apps.api.tasks.training_tasks import train_model_task
 from packages.ingestion_engine.import_transactions import parse_file
 
 router = APIRouter(prefix="/training", tags=["training"])
 logger = structlog.get_logger()
 
+# Structured parser columns preserved under transactions.raw_data
+RAW_DATA_COLUMNS = ["method", "entity", "ref", "location", "type", "meta"]
+
+INSERT_CHUNK_ROWS = 1000
+MAX_CONCURRENT_INSERTS = 4
+
 
-def prepare_transaction_payload(row, user_id: str) -> dict:
-    """Construct DB payload from a DataFrame row.
+def prepare_transaction_payload(row: Mapping, user_id: str) -> dict:
+    """Construct DB payload from a DataFrame row or a plain dict.
 
-    Uses the new unified 6-field fingerprint (BUG-02 fix).
+    Uses the new unified 6-field fingerprint (BUG-02 fix). category and
+    type are left to insert_transactions (migration 003).
     """
     if isinstance(row["date"], pd.Timestamp):
         date_str = row["date"].strftime("%Y-%m-%d")
@@ -45,7 +60,7 @@ def prepare_transaction_payload(row, user_id: str) -> dict:
     )
 
     raw_data = {}
-    for col in ["method", "entity", "ref", "location", "type", "meta"]:
+    for col in RAW_DATA_COLUMNS:
         if col in row:
             val = row[col]
             raw_data[col] = "" if pd.isna(val) or val is None else val
@@ -56,38 +71,133 @@ def prepare_transaction_payload(row, user_id: str) -> dict:
         "amount": amount,
         "description": desc,
         "merchant_name": merchant,
-        "category": "Uncategorized",
-        "type": "expense" if amount < 0 else "income",
         "fingerprint": fingerprint,
         "raw_data": raw_data,
     }
 
 
+def _date_strings(dates: pd.Series) -> pd.Series:
+    """Format a date column as YYYY-MM-DD, stringifying non-timestamps as-is.
+
+    parse_file already emits ISO strings, so an all-string column (checked
+    by one C-level dtype inference pass) is returned untouched.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.dt.strftime("%Y-%m-%d").where(dates.notna(), dates.map(str))
+    if pd.api.types.infer_dtype(dates, skipna=False) == "string":
+        return dates
+    return dates.map(
+        lambda v: v.strftime("%Y-%m-%d") if isinstance(v, pd.Timestamp) else str(v)
+    )
+
+
+def _text_column(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[column].map(str)
+
+
+def prepare_transaction_payloads(df: pd.DataFrame, user_id: str) -> list[dict]:
+    """Construct DB payloads for every row of a parsed DataFrame.
+
+    Column-wise equivalent of calling prepare_transaction_payload() on each
+    row: dates, amounts and text fields are converted as whole columns and
+    all fingerprints are hashed in one batch.
+    """
+    if df.empty:
+        return []
+
+    dates = _date_strings(df["date"])
+    amounts = df["amount"].astype(float)
+    descriptions = _text_column(df, "description")
+    merchants = _text_column(df, "merchant")
+
+    fingerprints = generate_fingerprints_from_columns(
+        dates=dates,
+        amounts=amounts,
+        merchants=merchants,
+        descriptions=descriptions,
+        payment_methods=df.get("payment_method"),
+        references=df.get("reference"),
+    )
+
+    raw_cols = [col for col in RAW_DATA_COLUMNS if col in df.columns]
+    raw_values = [
+        df[col].astype(object).where(df[col].notna(), "").tolist() for col in raw_cols
+    ]
+    if raw_cols:
+        raw_data = [dict(zip(raw_cols, values)) for values in zip(*raw_values)]
+    else:
+        raw_data = [{} for _ in range(len(df))]
+
+    return [
+        {
+            "user_id": user_id,
+            "transaction_date": date_str,
+            "amount": amount,
+            "description": desc,
+            "merchant_name": merchant,
+            "fingerprint": fingerprint,
+            "raw_data": raw,
+        }
+        for date_str, amount, desc, merchant, fingerprint, raw in zip(
+            dates.tolist(),
+            amounts.tolist(),
+            descriptions.tolist(),
+            merchants.tolist(),
+            fingerprints,
+            raw_data,
+        )
+    ]
+
+
+async def insert_transactions(client: Client, rows: list[dict]) -> None:
+    """Insert payloads via the insert_transactions RPC (migrations 002, 003).
+
+    Rows go out in INSERT_CHUNK_ROWS-sized chunks, up to
+    MAX_CONCURRENT_INSERTS at a time, each on a worker thread via run_db.
+    This bounds the request body size and overlaps round-trips. Raises the
+    first chunk failure; chunks already written stay, and a retried upload
+    skips them by fingerprint.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_INSERTS)
+
+    async def insert_chunk(chunk: list[dict]) -> None:
+        async with semaphore:
+            await run_db(
+                lambda: client.rpc("insert_transactions", {"payload": chunk}).execute()
+            )
+
+    await asyncio.gather(*(
+        insert_chunk(rows[start:start + INSERT_CHUNK_ROWS])
+        for start in range(0, len(rows), INSERT_CHUNK_ROWS)
+    ))
+
+
 @router.post("/upload")
 async def upload_training_data(
     file: UploadFile = File(...),
     password: Optional[str] = Form(None),
     client: Client = Depends(get_user_client),
+    user_id: str = Depends(get_current_user),
 ):
     """Upload transaction file, ingest into DB, and trigger training."""
-    contents = await file.read()
-    file_hash = hashlib.sha256(contents).hexdigest()
+    size, file_hash = await hash_upload(file, max_bytes=MAX_UPLOAD_BYTES)
+    if not size:
+        raise HTTPException(status_code=400, detail="Empty file.")
 
-    user_response = client.auth.get_user()
-    if not user_response or not user_response.user:
-        raise HTTPException(status_code=401, detail="Invalid bearer token")
-    user_id = user_response.user.id
-
-    # Check duplicates
+    # Check duplicates; the SELECT only runs when the Bloom filter says
+    # this hash was probably uploaded before.
     try:
-        existing = (
-            client.table("uploaded_files")
+        maybe_seen = await run_db(upload_maybe_seen, client, user_id, file_hash)
+        existing = maybe_seen and await run_db(
+            lambda: client.table("uploaded_files")
             .select("id")
             .eq("user_id", user_id)
             .eq("file_hash", file_hash)
             .execute()
         )
-        if existing.data:
+        if existing and existing.data:
             raise HTTPException(
                 status_code=400,
                 detail="This file has already been uploaded for training.",
@@ -99,9 +209,7 @@ async def upload_training_data(
 
     # Parse
     try:
-        if not contents:
-            raise HTTPException(status_code=400, detail="Empty file.")
-        df = parse_file(contents, file.filename, password=password)
+        df = parse_file(file.file, file.filename, password=password)
         if df.empty:
             raise HTTPException(status_code=400, detail="No valid transactions found.")
     except HTTPException:
@@ -112,35 +220,29 @@ async def upload_training_data(
 
     # Register upload
     try:
-        client.table("uploaded_files").insert({
+        await run_db(lambda: client.table("uploaded_files").insert({
             "user_id": user_id,
             "file_hash": file_hash,
             "filename": file.filename,
             "upload_type": "training",
-        }).execute()
+        }).execute())
     except Exception as e:
         if "duplicate key" in str(e) or "23505" in str(e):
             raise HTTPException(status_code=400, detail="File already uploaded.")
         raise HTTPException(status_code=500, detail="Failed to register upload")
+    await run_db(remember_upload, user_id, file_hash)
 
     # Insert transactions
-    transactions_to_insert = [
-        prepare_transaction_payload(row, user_id)
-        for _, row in df.iterrows()
-    ]
+    transactions_to_insert = prepare_transaction_payloads(df, user_id)
 
     try:
-        client.table("transactions").upsert(
-            transactions_to_insert,
-            on_conflict="user_id, fingerprint",
-            ignore_duplicates=True,
-        ).execute()
+        await insert_transactions(client, transactions_to_insert)
     except Exception as e:
         logger.error("db_insert_failed", error=str(e))
         try:
-            client.table("uploaded_files").delete().eq(
+            await run_db(lambda: client.table("uploaded_files").delete().eq(
                 "user_id", user_id
-            ).eq("file_hash", file_hash).execute()
+            ).eq("file_hash", file_hash).execute())
         except Exception:
             logger.warning("rollback_failed")
         raise HTTPException(status_code=500, detail="Database error")
@@ -152,7 +254,9 @@ async def upload_training_data(
             "status": "pending",
             "logs": "Job created via API upload.",
         }
-        job_res = client.table("training_jobs").insert(job_data).execute()
+        job_res = await run_db(
+            lambda: client.table("training_jobs").insert(job_data).execute()
+        )
         job_id = job_res.data[0]["id"]
     except Exception as e:
         logger.error("job_enqueue_failed", error=str(e))
@@ -173,8 +277,8 @@ async def get_training_status(
 ):
     """Get training job status by ID."""
     try:
-        res = (
-            client.table("training_jobs")
+        res = await run_db(
+            lambda: client.table("training_jobs")
             .select("*")
             .eq("id", job_id)
             .single()
@@ -187,17 +291,16 @@ async def get_training_status(
 
 
 @router.get("/latest")
-async def get_latest_training_job(client: Client = Depends(get_user_client)):
+async def get_latest_training_job(
+    client: Client = Depends(get_user_client),
+    user_id: str = Depends(get_current_user),
+):
     """Get the latest training job for the current user."""
     try:
-        user_response = client.auth.get_user()
-        if not user_response or not user_response.user:
-            raise HTTPException(status_code=401, detail="Invalid bearer token")
-
-        res = (
-            client.table("training_jobs")
+        res = await run_db(
+            lambda: client.table("training_jobs")
             .select("*")
-            .eq("user_id", user_response.user.id)
+            .eq("user_id", user_id)
             .order("created_at", desc=True)
             .limit(1)
             .execute()
@@ -214,63 +317,59 @@ async def train_model_async(
     batch_size: int = 32,
     learning_rate: float = 1e-4,
     client: Client = Depends(get_user_client),
+    user_id: str = Depends(get_current_user),
 ):
     """Start async training job. Returns immediately with job_id."""
     try:
-        user_response = client.auth.get_user()
-        if not user_response or not user_response.user:
-            raise HTTPException(status_code=401, detail="Invalid bearer token")
-        user_id = user_response.user.id
-
-        res = (
-            client.table("transactions")
-            .select("description, category")
+        res = await run_db(
+            lambda: client.table("transactions")
+            .select("id", count="exact", head=True)
             .eq("user_id", user_id)
             .not_.is_("category", None)
             .execute()
         )
+        samples = res.count or 0
 
-        if not res.data or len(res.data) < 10:
+        if samples < 10:
             raise HTTPException(
                 status_code=400,
                 detail="Need at least 10 labeled transactions for training.",
             )
 
-        texts = [tx["description"] for tx in res.data]
-        from packages.categorization.constants import CATEGORIES
-        category_to_idx = {cat: idx for idx, cat in enumerate(CATEGORIES)}
-        labels = [category_to_idx.get(tx["category"], 0) for tx in res.data]
-
         job_data = {
             "user_id": user_id,
             "status": "pending",
-            "logs": f"Queued training with {len(res.data)} samples...",
+            "logs": f"Queued training with {samples} samples...",
         }
-        job_res = client.table("training_jobs").insert(job_data).execute()
+        job_res = await run_db(
+            lambda: client.table("training_jobs").insert(job_data).execute()
+        )
         job_id = job_res.data[0]["id"]
 
-        task = train_model_task.delay(
-            texts=texts,
-            labels=labels,
-            user_id=user_id,
-            job_id=job_id,
-            epochs=epochs,
-            batch_size=batch_size,
-            learning_rate=learning_rate,
+        # The worker reads the samples itself; only ids and settings are sent
+        task = train_model_task.apply_async(
+            kwargs={
+                "user_id": user_id,
+                "job_id": job_id,
+                "epochs": epochs,
+                "batch_size": batch_size,
+                "learning_rate": learning_rate,
+            },
+            queue="training",
         )
 
-        client.table("training_jobs").update({
+        await run_db(lambda: client.table("training_jobs").update({
             "celery_task_id": task.id,
             "status": "queued",
-        }).eq("id", job_id).execute()
+        }).eq("id", job_id).execute())
 
         return {
             "status": "queued",
-            "message": f"Training job queued with {len(res.data)} samples",
+            "message": f"Training job queued with {samples} samples",
             "job_id": job_id,
             "task_id": task.id,
             "epochs": epochs,
-            "samples": len(res.data),
+            "samples": samples,
         }
 
     except HTTPException:
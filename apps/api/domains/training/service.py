@@ -1 +1,40 @@
 """Training service — job management, model training orchestration."""
+
+from supabase import Client
+
+from packages.categorization.constants import CATEGORIES
+
+# Label index for each category name; unknown categories train as index 0
+CATEGORY_TO_IDX = {cat: idx for idx, cat in enumerate(CATEGORIES)}
+
+# Labeled transactions are read in pages of this size for training
+LABELED_PAGE_ROWS = 1000
+
+
+def fetch_labeled_samples(client: Client, user_id: str) -> tuple[list[str], list[int]]:
+    """Read the user's labeled transactions as (texts, label indices).
+
+    Pages through the rows LABELED_PAGE_ROWS at a time, ordered by id so
+    pages neither overlap nor skip rows, and keeps only the two output
+    lists, so at most one page of row dicts is alive at once. Blocking.
+    """
+    texts: list[str] = []
+    labels: list[int] = []
+    category_idx = CATEGORY_TO_IDX.get
+    start = 0
+    while True:
+        page = (
+            client.table("transactions")
+            .select("description, category")
+            .eq("user_id", user_id)
+            .not_.is_("category", None)
+            .order("id")
+            .range(start, start + LABELED_PAGE_ROWS - 1)
+            .execute()
+        ).data or []
+        texts.extend(tx["description"] for tx in page)
+        labels.extend(category_idx(tx["category"], 0) for tx in page)
+        if len(page) < LABELED_PAGE_ROWS:
+            break
+        start += LABELED_PAGE_ROWS
+    return texts, labels
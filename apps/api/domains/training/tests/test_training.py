@@ -1,5 +1,7 @@
 """Tests for training domain — BUG-01 verification."""
 
+import os
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
@@ -61,3 +63,232 @@ class TestUpdateJobStatus:
 
         # Should not raise
         _update_job_status(job_id="test-job-789", status="completed")
+
+
+class TestClassifyBatchTask:
+    """Batch classification loads the checkpoint once for the whole list."""
+
+    @pytest.fixture(autouse=True)
+    def empty_model_cache(self):
+        from apps.api.tasks.training_tasks import _MODEL_CACHE
+        _MODEL_CACHE.clear()
+        yield
+        _MODEL_CACHE.clear()
+
+    @patch("apps.api.tasks.training_tasks.os.path.getmtime", return_value=1.0)
+    @patch("apps.api.tasks.training_tasks._classify_texts")
+    @patch("apps.api.tasks.training_tasks._load_classifier")
+    def test_single_model_load_for_batch(self, mock_load, mock_classify, _mtime):
+        mock_classify.side_effect = lambda _clf, texts: [
+            {"category": "Misc", "confidence": 0.5} for _ in texts
+        ]
+
+        from apps.api.tasks.training_tasks import classify_batch_task
+
+        results = classify_batch_task(["a", "b", "c"], "/tmp/model.pt")
+
+        assert len(results) == 3
+        mock_load.assert_called_once_with("/tmp/model.pt", "cloud")
+        mock_classify.assert_called_once()
+
+    @patch("apps.api.tasks.training_tasks.os.path.getmtime", return_value=1.0)
+    @patch("apps.api.tasks.training_tasks._load_classifier")
+    def test_load_failure_marks_every_item(self, mock_load, _mtime):
+        mock_load.side_effect = FileNotFoundError("missing")
+
+        from apps.api.tasks.training_tasks import classify_batch_task
+
+        results = classify_batch_task(["a", "b"], "/tmp/missing.pt")
+
+        assert [r["category"] for r in results] == ["Uncategorized"] * 2
+        assert all(r["confidence"] == 0.0 for r in results)
+
+
+class TestClassifierCache:
+    """Worker keeps loaded classifiers keyed by checkpoint path and mtime."""
+
+    @pytest.fixture(autouse=True)
+    def empty_model_cache(self):
+        from apps.api.tasks.training_tasks import _MODEL_CACHE
+        _MODEL_CACHE.clear()
+        yield
+        _MODEL_CACHE.clear()
+
+    @patch("apps.api.tasks.training_tasks._load_classifier")
+    def test_reuses_until_checkpoint_changes(self, mock_load, tmp_path):
+        mock_load.side_effect = lambda *_: object()
+        model_path = tmp_path / "final_model.pt"
+        model_path.write_bytes(b"v1")
+
+        from apps.api.tasks.training_tasks import _MODEL_CACHE, _get_cached_classifier
+
+        first = _get_cached_classifier(str(model_path))
+        assert _get_cached_classifier(str(model_path)) is first
+        assert mock_load.call_count == 1
+
+        os.utime(model_path, (0, os.path.getmtime(model_path) + 10))
+        assert _get_cached_classifier(str(model_path)) is not first
+        assert mock_load.call_count == 2
+        assert len(_MODEL_CACHE) == 1
+
+    @patch("apps.api.tasks.training_tasks.os.path.getmtime", return_value=1.0)
+    @patch("apps.api.tasks.training_tasks._load_classifier")
+    def test_evicts_least_recently_used(self, mock_load, _mtime):
+        mock_load.side_effect = lambda *_: object()
+
+        from apps.api.tasks.training_tasks import (
+            MODEL_CACHE_SIZE,
+            _MODEL_CACHE,
+            _get_cached_classifier,
+        )
+
+        for i in range(MODEL_CACHE_SIZE + 1):
+            _get_cached_classifier(f"/models/{i}.pt")
+
+        assert len(_MODEL_CACHE) == MODEL_CACHE_SIZE
+        assert ("/models/0.pt", "cloud", 1.0) not in _MODEL_CACHE
+
+
+class TestCategoryIndex:
+    """Training labels follow the classifier's category order."""
+
+    def test_index_matches_category_order(self):
+        from apps.api.domains.training.service import CATEGORY_TO_IDX
+        from packages.categorization.constants import Category
+
+        assert CATEGORY_TO_IDX[Category.FOOD.value] == 0
+        assert CATEGORY_TO_IDX[Category.MISC.value] == len(CATEGORY_TO_IDX) - 1
+        assert Category.UNCATEGORIZED.value not in CATEGORY_TO_IDX
+
+
+class TestFetchLabeledSamples:
+    """Labeled transactions are read page by page."""
+
+    def test_pages_until_short_page(self, monkeypatch):
+        from apps.api.domains.training import service
+        from packages.categorization.constants import Category
+
+        monkeypatch.setattr(service, "LABELED_PAGE_ROWS", 2)
+        rows = [
+            {"description": "Swiggy", "category": Category.FOOD.value},
+            {"description": "Uber", "category": "Not a category"},
+            {"description": "Misc", "category": Category.MISC.value},
+        ]
+        ranges = []
+
+        query = MagicMock()
+        for method in ("select", "eq", "is_", "order"):
+            getattr(query, method).return_value = query
+        query.not_ = query
+
+        def fetch_range(start, end):
+            ranges.append((start, end))
+            return MagicMock(execute=lambda: MagicMock(data=rows[start:end + 1]))
+
+        query.range.side_effect = fetch_range
+        client = MagicMock()
+        client.table.return_value = query
+
+        texts, labels = service.fetch_labeled_samples(client, "user-1")
+
+        assert ranges == [(0, 1), (2, 3)]
+        assert texts == ["Swiggy", "Uber", "Misc"]
+        assert labels == [0, 0, service.CATEGORY_TO_IDX[Category.MISC.value]]
+
+
+class TestTrainEndpoint:
+    """/train enqueues ids and settings, not the training corpus."""
+
+    def test_task_receives_no_samples(self):
+        from fastapi.testclient import TestClient
+
+        from apps.api.core.auth import get_current_user, get_user_client
+        from apps.api.main import app
+
+        client = MagicMock()
+        query = client.table.return_value
+        for method in ("select", "eq", "is_", "insert", "update"):
+            getattr(query, method).return_value = query
+        query.not_ = query
+        query.execute.side_effect = [
+            MagicMock(count=25),
+            MagicMock(data=[{"id": "job-1"}]),
+            MagicMock(),
+        ]
+        app.dependency_overrides[get_current_user] = lambda: "user-1"
+        app.dependency_overrides[get_user_client] = lambda: client
+        try:
+            with patch(
+                "apps.api.domains.training.router.train_model_task"
+            ) as mock_task:
+                mock_task.apply_async.return_value = MagicMock(id="task-1")
+                res = TestClient(app).post("/api/v1/training/train")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert res.status_code == 200
+        assert res.json()["samples"] == 25
+        kwargs = mock_task.apply_async.call_args.kwargs
+        assert kwargs["queue"] == "training"
+        assert kwargs["kwargs"]["job_id"] == "job-1"
+        assert "texts" not in kwargs["kwargs"]
+
+
+class TestTrainTaskFetchesSamples:
+    """The worker reads labeled transactions when none are passed in."""
+
+    @patch("apps.api.tasks.training_tasks._update_job_status")
+    @patch("apps.api.domains.training.service.fetch_labeled_samples")
+    @patch("apps.api.core.auth.get_service_client")
+    def test_fetches_with_service_client(self, mock_client, mock_fetch, _status):
+        import sys
+        from types import ModuleType
+
+        from apps.api.tasks.training_tasks import train_model_task
+
+        mock_fetch.return_value = (["Swiggy", "Uber"], [0, 1])
+        pipeline_cls = MagicMock()
+        pipeline_cls.return_value.train.return_value = {"loss": 0.1}
+        fake_pipeline = ModuleType("packages.categorization.training_pipeline")
+        fake_pipeline.HypCDTrainingPipeline = pipeline_cls
+        fake_pipeline.TrainingConfig = MagicMock()
+
+        with patch.dict(
+            sys.modules, {"packages.categorization.training_pipeline": fake_pipeline}
+        ):
+            result = train_model_task.run(
+                user_id="user-1", job_id="job-1", checkpoint_dir="/tmp/ckpt"
+            )
+
+        mock_fetch.assert_called_once_with(mock_client.return_value, "user-1")
+        data_loader = pipeline_cls.return_value.train.call_args.args[0]
+        assert data_loader() == (["Swiggy", "Uber"], [0, 1])
+        assert result["status"] == "completed"
+
+
+class TestUploadTrainingData:
+    """Empty uploads are rejected before any database work."""
+
+    def test_empty_file_rejected_before_duplicate_check(self):
+        from fastapi.testclient import TestClient
+
+        from apps.api.core.auth import get_current_user, get_user_client
+        from apps.api.main import app
+
+        client = MagicMock()
+        app.dependency_overrides[get_current_user] = lambda: "user-1"
+        app.dependency_overrides[get_user_client] = lambda: client
+        try:
+            with patch(
+                "apps.api.domains.training.router.upload_maybe_seen"
+            ) as maybe_seen:
+                res = TestClient(app).post(
+                    "/api/v1/training/upload",
+                    files={"file": ("empty.csv", b"", "text/csv")},
+                )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert res.status_code == 400
+        maybe_seen.assert_not_called()
+        client.table.assert_not_called()
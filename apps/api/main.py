@@ -9,14 +9,22 @@ Fixes:
 """
 
 import os
+import ssl
+
 import structlog
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
 
+from apps.api.core.auth import close_http_client
 from apps.api.core.config import settings
+from apps.api.core.db import configure_threadpool
 from apps.api.core.errors import register_error_handlers
 from apps.api.core.logging import setup_logging
+from apps.api.core.responses import ORJSONResponse
+from apps.api.domains.categorization.service import unload_classifier
+from apps.api.domains.ingestion.service import cpu_has_sha_extensions
 
 # Domain routers (new)
 from apps.api.domains.ingestion.router import router as ingestion_router
@@ -40,8 +48,17 @@ async def lifespan(app: FastAPI):
         json_output=(os.getenv("ENVIRONMENT", "development") == "production"),
     )
     logger.info("app_starting", version="0.3.0")
+    configure_threadpool()
+    logger.info("fingerprint_hash_backend", openssl_version=ssl.OPENSSL_VERSION)
+    if cpu_has_sha_extensions() is False:
+        logger.warning(
+            "sha_extensions_unavailable",
+            detail="CPU lacks SHA-NI/ARMv8 SHA2; upload hashing uses portable SHA-256",
+        )
     yield
     logger.info("app_stopping")
+    unload_classifier()
+    close_http_client()
 
 
 app = FastAPI(
@@ -49,6 +66,9 @@ app = FastAPI(
     description="Bridges the Python intelligence layer to the Next.js frontend.",
     version="0.3.0",
     lifespan=lifespan,
+    # Wrapped in Default() so endpoints with a response_model keep FastAPI's
+    # direct Pydantic-to-bytes path; plain dict returns are rendered by orjson.
+    default_response_class=Default(ORJSONResponse),
 )
 
 # Register RFC 7807 error handlers (ARCH-02 fix)
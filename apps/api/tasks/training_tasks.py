@@ -7,18 +7,21 @@ wrote the status back to DB, leaving jobs stuck at "queued" forever.
 
 import logging
 import os
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Optional
 from celery import shared_task
 from celery.exceptions import MaxRetriesExceededError
 
-from packages.categorization.training_pipeline import (
-    HypCDTrainingPipeline,
-    TrainingConfig,
-)
-from packages.categorization.backends.cloud import CloudBackend
-
 logger = logging.getLogger(__name__)
 
+# Loaded classifiers kept in worker memory, keyed by
+# (model_path, backend_type, checkpoint mtime) so a re-exported checkpoint
+# is picked up on the next call. Small LRU: each entry holds a full encoder.
+MODEL_CACHE_SIZE = 4
+_MODEL_CACHE: "OrderedDict[tuple[str, str, float], object]" = OrderedDict()
+_model_cache_lock = threading.Lock()
+
 
 def _update_job_status(
     job_id: str,
@@ -53,24 +56,38 @@ def _update_job_status(
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def train_model_task(
     self,
-    texts: List[str],
-    labels: List[int],
     user_id: str,
     job_id: str,
     epochs: int = 50,
     batch_size: int = 32,
     learning_rate: float = 1e-4,
     checkpoint_dir: str = "/app/checkpoints",
+    texts: Optional[List[str]] = None,
+    labels: Optional[List[int]] = None,
 ) -> Dict:
     """Async task to train HypCD model.
 
     BUG-01 fix: Now updates training_jobs table with status on
     completion/failure via service-role Supabase client.
+
+    Without texts/labels the user's labeled transactions are read from
+    Supabase here, so the task message carries only ids and settings.
     """
+    # Imported here so the API process (which only enqueues) never loads torch
+    from packages.categorization.training_pipeline import (
+        HypCDTrainingPipeline,
+        TrainingConfig,
+    )
+
     try:
         logger.info(f"Starting training job {job_id} for user {user_id}")
         _update_job_status(job_id, "running")
 
+        if texts is None:
+            from apps.api.core.auth import get_service_client
+            from apps.api.domains.training.service import fetch_labeled_samples
+            texts, labels = fetch_labeled_samples(get_service_client(), user_id)
+
         config = TrainingConfig(
             epochs=epochs,
             batch_size=batch_size,
@@ -129,6 +146,76 @@ def train_model_task(
             }
 
 
+def _load_classifier(model_path: str, backend_type: str = "cloud"):
+    """Build a HypCDClassifier from an exported checkpoint, ready for eval."""
+    import torch
+    from packages.categorization.hypcd import HypCDClassifier
+
+    if backend_type == "cloud":
+        from packages.categorization.backends.cloud import CloudBackend
+        backend = CloudBackend()
+    else:
+        from packages.categorization.backends.mobile import MobileBackend
+        backend = MobileBackend()
+
+    checkpoint = torch.load(model_path, map_location="cpu")
+
+    classifier = HypCDClassifier(
+        backend=backend,
+        num_classes=checkpoint["config"]["num_classes"],
+        proj_dim=checkpoint["config"]["proj_dim"],
+        backend_type=backend_type,
+    )
+    classifier.load_state_dict(checkpoint["classifier"])
+    classifier.eval()
+    return classifier
+
+
+def _get_cached_classifier(model_path: str, backend_type: str = "cloud"):
+    """Return a loaded classifier, reusing one from the worker's LRU cache."""
+    key = (model_path, backend_type, os.path.getmtime(model_path))
+    with _model_cache_lock:
+        classifier = _MODEL_CACHE.get(key)
+        if classifier is not None:
+            _MODEL_CACHE.move_to_end(key)
+            return classifier
+
+    classifier = _load_classifier(model_path, backend_type)
+
+    with _model_cache_lock:
+        # Drop entries for older versions of this checkpoint
+        for stale in [k for k in _MODEL_CACHE if k[:2] == key[:2]]:
+            del _MODEL_CACHE[stale]
+        _MODEL_CACHE[key] = classifier
+        while len(_MODEL_CACHE) > MODEL_CACHE_SIZE:
+            _MODEL_CACHE.popitem(last=False)
+    return classifier
+
+
+def _classify_texts(classifier, texts: List[str]) -> List[Dict]:
+    """Run one batched forward pass and map each row to its label."""
+    import torch
+
+    with torch.no_grad():
+        embeddings = classifier.backend.embed_batch(texts)
+        hyp_embeddings = classifier.embedder.projector(embeddings)
+        logits = classifier.classifier(hyp_embeddings)
+        probs = torch.softmax(logits, dim=-1)
+        confidences, pred_indices = probs.max(dim=-1)
+
+    labels = classifier.labels
+    return [
+        {
+            "category": labels[pred_idx],
+            "confidence": confidence,
+            "all_probabilities": dict(zip(labels, row)),
+        }
+        for pred_idx, confidence, row in zip(
+            pred_indices.tolist(), confidences.tolist(), probs.tolist()
+        )
+    ]
+
+
 @shared_task
 def classify_transaction_task(
     text: str,
@@ -146,52 +233,9 @@ def classify_transaction_task(
     Returns:
         Dictionary with prediction and confidence
     """
-    import torch
-    from packages.categorization.hypcd import HypCDClassifier
-    
     try:
-        # Initialize backend
-        if backend_type == "cloud":
-            from packages.categorization.backends.cloud import CloudBackend
-            backend = CloudBackend()
-        else:
-            from packages.categorization.backends.mobile import MobileBackend
-            backend = MobileBackend()
-        
-        # Load model
-        checkpoint = torch.load(model_path, map_location="cpu")
-        
-        # Initialize classifier
-        classifier = HypCDClassifier(
-            backend=backend,
-            num_classes=checkpoint["config"]["num_classes"],
-            proj_dim=checkpoint["config"]["proj_dim"],
-            backend_type=backend_type,
-        )
-        classifier.load_state_dict(checkpoint["classifier"])
-        classifier.eval()
-        
-        # Get embedding and predict
-        with torch.no_grad():
-            embedding = backend.embed(text).unsqueeze(0)
-            hyp_embedding = classifier.embedder.projector(embedding)
-            logits = classifier.classifier(hyp_embedding)
-            probs = torch.softmax(logits, dim=-1)
-            pred_idx = torch.argmax(probs, dim=-1).item()
-            confidence = probs[0][pred_idx].item()
-        
-        # Map to category name
-        category = classifier.labels[pred_idx]
-        
-        return {
-            "category": category,
-            "confidence": confidence,
-            "all_probabilities": {
-                label: prob.item()
-                for label, prob in zip(classifier.labels, probs[0])
-            },
-        }
-        
+        classifier = _get_cached_classifier(model_path, backend_type)
+        return _classify_texts(classifier, [text])[0]
     except Exception as exc:
         logger.error(f"Classification failed: {exc}")
         return {
@@ -199,3 +243,36 @@ def classify_transaction_task(
             "confidence": 0.0,
             "error": str(exc),
         }
+
+
+@shared_task
+def classify_batch_task(
+    texts: List[str],
+    model_path: str,
+    backend_type: str = "cloud",
+) -> List[Dict]:
+    """
+    Classify many transactions with one model load and one forward pass.
+
+    Replaces dispatching classify_transaction_task once per description,
+    which paid a broker round-trip and a checkpoint load for every item.
+
+    Args:
+        texts: Transaction descriptions
+        model_path: Path to trained model
+        backend_type: Backend type ('cloud' or 'mobile')
+
+    Returns:
+        One prediction dictionary per text, in input order
+    """
+    if not texts:
+        return []
+    try:
+        classifier = _get_cached_classifier(model_path, backend_type)
+        return _classify_texts(classifier, texts)
+    except Exception as exc:
+        logger.error(f"Batch classification failed: {exc}")
+        return [
+            {"category": "Uncategorized", "confidence": 0.0, "error": str(exc)}
+            for _ in texts
+        ]
@@ -16,23 +16,21 @@ def test_prepare_transaction_payload_structure():
     3. Handles missing structured fields gracefully
     """
 
-    # Mock Dataframe Row
+    # A plain dict stands in for the DataFrame row
     # Simulating what BankStatementParser returns
-    data = {
-        "date": [pd.Timestamp("2023-06-07")],
-        "amount": [-162.0],
-        "description": ["POS 1234 SWIGGY BANGALORE"],
-        "merchant": ["Swiggy"],
+    row = {
+        "date": pd.Timestamp("2023-06-07"),
+        "amount": -162.0,
+        "description": "POS 1234 SWIGGY BANGALORE",
+        "merchant": "Swiggy",
         # Structured Fields
-        "method": ["POS"],
-        "entity": ["Swiggy"],
-        "location": ["BANGALORE"],
-        "ref": ["3157044560"],
-        "type": ["DEBIT"],
-        "meta": [{"bank": "SBI"}],  # JSON object
+        "method": "POS",
+        "entity": "Swiggy",
+        "location": "BANGALORE",
+        "ref": "3157044560",
+        "type": "DEBIT",
+        "meta": {"bank": "SBI"},  # JSON object
     }
-    df = pd.DataFrame(data)
-    row = df.iloc[0]
 
     user_id = "test-user-id"
 
@@ -44,6 +42,9 @@ def test_prepare_transaction_payload_structure():
     assert payload["amount"] == -162.0
     assert payload["merchant_name"] == "Swiggy"
     assert payload["transaction_date"] == "2023-06-07"
+    # Filled in server-side by insert_transactions (migration 003)
+    assert "category" not in payload
+    assert "type" not in payload
 
     # Check raw_data presence and content
     assert "raw_data" in payload
@@ -60,15 +61,13 @@ def test_prepare_transaction_payload_missing_fields():
     """
     Verifies behavior when structured columns are missing (backward compatibility)
     """
-    data = {
-        "date": [pd.Timestamp("2023-06-07")],
-        "amount": [-100.0],
-        "description": ["CASH WDL"],
-        "merchant": ["CASH"],
+    row = {
+        "date": pd.Timestamp("2023-06-07"),
+        "amount": -100.0,
+        "description": "CASH WDL",
+        "merchant": "CASH",
     }
     # Note: method, entity, etc. are missing
-    df = pd.DataFrame(data)
-    row = df.iloc[0]
 
     user_id = "test-user-id-2"
 
@@ -79,3 +78,57 @@ def test_prepare_transaction_payload_missing_fields():
     # Should probably be empty strings or None, depending on implementation
     # Let's assert keys exist but are empty/None for safety
     assert payload["raw_data"].get("method") in [None, ""]
+
+
+def test_prepare_transaction_payloads_matches_row_wise():
+    """
+    The column-wise builder must produce exactly what the per-row helper does.
+    """
+    from apps.api.domains.training.router import prepare_transaction_payloads
+
+    df = pd.DataFrame({
+        "date": ["2023-06-07", "2023-06-08"],
+        "amount": [-162.0, 2500],
+        "description": ["POS 1234 SWIGGY BANGALORE", None],
+        "merchant": ["Swiggy", "ACME"],
+        "method": ["POS", None],
+        "meta": [{"bank": "SBI"}, ""],
+    })
+
+    expected = [prepare_transaction_payload(row, "u1") for _, row in df.iterrows()]
+    assert prepare_transaction_payloads(df, "u1") == expected
+
+
+def test_prepare_transaction_payloads_mixed_date_column():
+    """
+    Timestamps mixed into a string date column are still formatted per row.
+    """
+    from apps.api.domains.training.router import prepare_transaction_payloads
+
+    df = pd.DataFrame({
+        "date": pd.Series(["2023-06-07", pd.Timestamp("2023-06-08 10:30")], dtype=object),
+        "amount": [-1.0, 2.0],
+    })
+
+    expected = [prepare_transaction_payload(row, "u1") for _, row in df.iterrows()]
+    payloads = prepare_transaction_payloads(df, "u1")
+    assert payloads == expected
+    assert [p["transaction_date"] for p in payloads] == ["2023-06-07", "2023-06-08"]
+
+
+def test_insert_transactions_chunks_rpc_calls():
+    """
+    Large uploads are split into INSERT_CHUNK_ROWS-sized RPC payloads.
+    """
+    import asyncio
+    from unittest.mock import MagicMock
+
+    from apps.api.domains.training import router
+
+    client = MagicMock()
+    rows = [{"fingerprint": str(i)} for i in range(router.INSERT_CHUNK_ROWS * 2 + 5)]
+
+    asyncio.run(router.insert_transactions(client, rows))
+
+    sizes = sorted(len(c.args[1]["payload"]) for c in client.rpc.call_args_list)
+    assert sizes == [5, router.INSERT_CHUNK_ROWS, router.INSERT_CHUNK_ROWS]
@@ -1,7 +1,9 @@
 import os
+import sys
 import time
 import logging
 from datetime import datetime, timezone
+from functools import lru_cache
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
@@ -32,15 +34,74 @@ if not KEY:
     )
 
 
+# Idle polling backs off exponentially between these bounds and drops back
+# to the minimum as soon as a job is found.
+POLL_MIN_SECONDS = 1.0
+POLL_MAX_SECONDS = 30.0
+
+# Progress lines reach training_jobs.logs at most this often, plus at
+# explicit flush() points before long phases.
+LOG_FLUSH_SECONDS = 2.0
+
+
+@lru_cache(maxsize=1)
 def get_supabase() -> Client:
+    """One service-role client (and HTTP connection pool) per worker process."""
     return create_client(URL, KEY)
 
 
-def train_model(job_id: str, user_id: str):
+class LogBuffer:
+    """Collects a job's progress lines and writes them to training_jobs.logs
+    in batches instead of one update per line."""
+
+    def __init__(self, supabase: Client, job_id: str):
+        self.supabase = supabase
+        self.job_id = job_id
+        self.lines: list[str] = []
+        self.unflushed = False
+        self.last_flush = time.monotonic()
+
+    def log(self, msg: str):
+        self.lines.append(msg)
+        self.unflushed = True
+        logger.info(f"[{self.job_id}] {msg}")
+        if time.monotonic() - self.last_flush > LOG_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        if self.unflushed:
+            self.supabase.table("training_jobs").update(
+                {"logs": "\n".join(self.lines)}
+            ).eq("id", self.job_id).execute()
+            self.unflushed = False
+        self.last_flush = time.monotonic()
+
+
+def _warmup():
+    """Pay the torch / pytorch-forecasting import (several seconds) and CUDA
+    context setup once at startup, before any job is claimed.
+
+    Exits the process if the training stack cannot be imported, instead of
+    claiming jobs only to fail each one.
+    """
+    try:
+        import torch
+
+        import packages.forecasting.trainer  # noqa: F401
+    except ImportError:
+        logger.exception("Training dependencies failed to import. Exiting.")
+        sys.exit(1)
+
+    if torch.cuda.is_available():
+        torch.zeros(1, device="cuda")
+
+
+def train_model(supabase: Client, job_id: str, user_id: str):
     """
     Executes the TFT training pipeline:
       fetch transactions -> prepare features -> train model -> save checkpoint.
     """
+    # Already loaded by _warmup(), so this is a sys.modules lookup.
     from packages.forecasting.trainer import (
         fetch_user_transactions,
         prepare_training_data,
@@ -48,22 +109,19 @@ def train_model(job_id: str, user_id: str):
         save_checkpoint_to_supabase,
     )
 
-    supabase = get_supabase()
     logger.info(f"Starting training for user {user_id} (Job {job_id})")
-
-    def update_logs(msg: str):
-        supabase.table("training_jobs").update({"logs": msg}).eq("id", job_id).execute()
-        logger.info(f"[{job_id}] {msg}")
+    progress = LogBuffer(supabase, job_id)
 
     # 1. Fetch data
-    update_logs("Fetching transactions from database...")
+    progress.log("Fetching transactions from database...")
     df = fetch_user_transactions(supabase, user_id)
     tx_count = len(df)
-    update_logs(f"Loaded {tx_count} transactions. Preparing features...")
+    progress.log(f"Loaded {tx_count} transactions. Preparing features...")
 
     # 2. Prepare features
     enriched = prepare_training_data(df)
-    update_logs(f"Prepared {len(enriched)} daily datapoints. Starting TFT training...")
+    progress.log(f"Prepared {len(enriched)} daily datapoints. Starting TFT training...")
+    progress.flush()  # visible for the whole training run
 
     # 3. Train
     trainer, model, dataset = run_training(enriched, max_epochs=30)
@@ -78,7 +136,7 @@ def train_model(job_id: str, user_id: str):
     }
 
     # 5. Save checkpoint
-    update_logs("Saving model checkpoint...")
+    progress.log("Saving model checkpoint...")
     checkpoint_path = save_checkpoint_to_supabase(supabase, trainer, user_id, job_id)
 
     # 6. Attach results to job
@@ -97,77 +155,71 @@ def train_model(job_id: str, user_id: str):
     return summary
 
 
+def process_next_job(supabase: Client) -> bool:
+    """Claim and run one pending training job; return False when idle.
+
+    The claim is a single claim_training_job() RPC (migration 004), which
+    marks the oldest pending job processing with FOR UPDATE SKIP LOCKED, so
+    concurrent workers never pick the same job.
+    """
+    response = supabase.rpc("claim_training_job", {}).execute()
+    if not response.data:
+        return False
+
+    job = response.data[0]
+    job_id = job["id"]
+    user_id = job["user_id"]
+    logger.info(f"Claimed training job {job_id}")
+
+    try:
+        logs = train_model(supabase, job_id, user_id)
+
+        supabase.table("training_jobs").update(
+            {
+                "status": "completed",
+                "logs": logs,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
+        ).eq("id", job_id).execute()
+
+        logger.info(f"Job {job_id} completed successfully.")
+
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {e}")
+        supabase.table("training_jobs").update(
+            {
+                "status": "failed",
+                "logs": str(e),
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
+        ).eq("id", job_id).execute()
+
+    return True
+
+
 def main():
     if not URL or not KEY:
         logger.error("Missing configuration. Exiting.")
         return
 
+    _warmup()
     supabase = get_supabase()
     logger.info("Worker started. Polling for jobs...")
 
+    delay = POLL_MIN_SECONDS
     while True:
         try:
             # Training Jobs (Forecasting / Active Learning)
-            response = (
-                supabase.table("training_jobs")
-                .select("*")
-                .eq("status", "pending")
-                .limit(1)
-                .execute()
-            )
-
-            if response.data:
-                job = response.data[0]
-                job_id = job["id"]
-                user_id = job["user_id"]
-
-                logger.info(f"Claiming training job {job_id}")
-                now_iso = datetime.now(timezone.utc).isoformat()
-
-                # Mark processing
-                claim_response = (
-                    supabase.table("training_jobs")
-                    .update({"status": "processing", "updated_at": now_iso})
-                    .eq("id", job_id)
-                    .eq("status", "pending")
-                    .execute()
-                )
-
-                if not claim_response.data:
-                    logger.info(f"Job {job_id} was already claimed by another worker.")
-                    continue
-
-                try:
-                    logs = train_model(job_id, user_id)
-
-                    supabase.table("training_jobs").update(
-                        {
-                            "status": "completed",
-                            "logs": logs,
-                            "updated_at": datetime.now(timezone.utc).isoformat(),
-                        }
-                    ).eq("id", job_id).execute()
-
-                    logger.info(f"Job {job_id} completed successfully.")
-
-                except Exception as e:
-                    logger.error(f"Job {job_id} failed: {e}")
-                    supabase.table("training_jobs").update(
-                        {
-                            "status": "failed",
-                            "logs": str(e),
-                            "updated_at": datetime.now(timezone.utc).isoformat(),
-                        }
-                    ).eq("id", job_id).execute()
-
+            if process_next_job(supabase):
+                delay = POLL_MIN_SECONDS
                 continue
 
-            # 3. No jobs
-            time.sleep(5)
-
         except Exception as e:
             logger.error(f"Worker loop error: {e}")
-            time.sleep(5)
+
+        # No jobs (or the poll failed): wait, then back off further
+        time.sleep(delay)
+        delay = min(delay * 2, POLL_MAX_SECONDS)
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import MagicMock, patch
 import sys
 import os
+from types import SimpleNamespace
 
 # Ensure import paths
 sys.path.append(os.getcwd())
@@ -9,26 +10,134 @@ sys.path.append(os.getcwd())
 from apps.worker import main
 
 
+class _FakeSupabase:
+    """Serves pending jobs through claim_training_job and records updates."""
+
+    def __init__(self, pending_jobs):
+        self.pending_jobs = list(pending_jobs)
+        self.updates = []  # (table, payload, (column, value))
+        self.rpc_calls = []
+
+    def rpc(self, name, params):
+        self.rpc_calls.append((name, params))
+        data = [self.pending_jobs.pop(0)] if self.pending_jobs else []
+        return _FakeQuery(lambda: data)
+
+    def table(self, name):
+        return _FakeTable(self, name)
+
+
+class _FakeTable:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def update(self, payload):
+        return _FakeFilter(self, payload)
+
+
+class _FakeFilter:
+    def __init__(self, table, payload):
+        self.table = table
+        self.payload = payload
+
+    def eq(self, column, value):
+        record = (self.table.name, self.payload, (column, value))
+        return _FakeQuery(lambda: self.table.client.updates.append(record))
+
+
+class _FakeQuery:
+    def __init__(self, run):
+        self.run = run
+
+    def execute(self):
+        return SimpleNamespace(data=self.run())
+
+
 class TestWorkerJobs(unittest.TestCase):
-    @patch("apps.worker.main.get_supabase")
-    def test_worker_polls_training_jobs(self, mock_get_supabase):
-        """Worker should poll training_jobs and process pending ones."""
+    def test_process_next_job_claims_via_rpc(self):
+        """A poll claims the queued job through the RPC, trains it and marks
+        it completed; the next poll finds nothing."""
+        sb = _FakeSupabase(pending_jobs=[{"id": "j1", "user_id": "u1"}])
+
+        with patch("apps.worker.main.train_model", return_value="ok") as train:
+            self.assertIs(main.process_next_job(sb), True)
+            self.assertIs(main.process_next_job(sb), False)
+
+        self.assertEqual(sb.rpc_calls, [("claim_training_job", {})] * 2)
+        train.assert_called_once_with(sb, "j1", "u1")
+        [(table, payload, where)] = sb.updates
+        self.assertEqual((table, where), ("training_jobs", ("id", "j1")))
+        self.assertEqual(payload["status"], "completed")
+        self.assertEqual(payload["logs"], "ok")
+
+    def test_process_next_job_idle(self):
+        """With nothing pending, one RPC is made and no table is touched."""
         mock_client = MagicMock()
-        mock_get_supabase.return_value = mock_client
+        mock_client.rpc.return_value.execute.return_value.data = []
 
-        # Verify main module has the expected functions
-        self.assertTrue(hasattr(main, "train_model"))
-        self.assertTrue(hasattr(main, "main"))
+        self.assertFalse(main.process_next_job(mock_client))
+        mock_client.table.assert_not_called()
 
+    @patch("apps.worker.main._warmup")
     @patch("apps.worker.main.get_supabase")
-    @patch("apps.worker.main.train_model")
-    def test_train_model_called_for_pending_job(
-        self, mock_train_model, mock_get_supabase
+    @patch("apps.worker.main.process_next_job")
+    @patch("apps.worker.main.time.sleep")
+    def test_idle_polling_backs_off_and_resets(
+        self, mock_sleep, mock_process, mock_get_supabase, mock_warmup
     ):
-        """Verify train_model is callable with job_id and user_id."""
-        mock_train_model.return_value = "Training complete."
-        mock_train_model("job-123", "user-abc")
-        mock_train_model.assert_called_with("job-123", "user-abc")
+        """Idle waits double up to the cap and reset once a job is found."""
+        mock_process.side_effect = [False] * 7 + [True, False]
+        delays = []
+
+        def sleep(seconds):
+            delays.append(seconds)
+            if len(delays) == 8:
+                raise KeyboardInterrupt
+
+        mock_sleep.side_effect = sleep
+
+        with patch.object(main, "URL", "https://x.supabase.co"), patch.object(
+            main, "KEY", "service-key"
+        ), self.assertRaises(KeyboardInterrupt):
+            main.main()
+
+        self.assertEqual(delays, [1.0, 2.0, 4.0, 8.0, 16.0, 30.0, 30.0, 1.0])
+        mock_warmup.assert_called_once()
+
+    @patch("apps.worker.main.process_next_job")
+    def test_main_exits_before_polling_when_training_imports_fail(self, mock_process):
+        """A broken training stack stops the worker before it claims jobs."""
+        with patch.object(main, "URL", "https://x.supabase.co"), patch.object(
+            main, "KEY", "service-key"
+        ), patch.dict(sys.modules, {"packages.forecasting.trainer": None}):
+            with self.assertRaises(SystemExit) as exc:
+                main.main()
+
+        self.assertEqual(exc.exception.code, 1)
+        mock_process.assert_not_called()
+
+    @patch("apps.worker.main.time.monotonic")
+    def test_log_buffer_batches_updates(self, mock_monotonic):
+        """Lines logged within the flush interval share one update."""
+        mock_client = MagicMock()
+        update = mock_client.table.return_value.update
+        mock_monotonic.return_value = 100.0
+
+        progress = main.LogBuffer(mock_client, "job-123")
+        progress.log("Fetching...")
+        progress.log("Loaded 10 transactions.")
+        update.assert_not_called()
+
+        progress.flush()
+        update.assert_called_once_with({"logs": "Fetching...\nLoaded 10 transactions."})
+
+        progress.flush()  # nothing new to write
+        self.assertEqual(update.call_count, 1)
+
+        mock_monotonic.return_value = 100.0 + main.LOG_FLUSH_SECONDS + 1
+        progress.log("Saving model checkpoint...")
+        self.assertEqual(update.call_count, 2)
 
 
 if __name__ == "__main__":
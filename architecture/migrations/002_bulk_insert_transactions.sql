@@ -0,0 +1,53 @@
+-- Migration: 002_bulk_insert_transactions
+
+-- 1. Bulk insert used by the training upload path.
+-- The whole batch arrives as a single jsonb array, so PostgREST parses one
+-- request body and Postgres expands it set-wise instead of binding one
+-- parameter row per dict. SECURITY INVOKER keeps the caller's RLS insert
+-- policy (auth.uid() = user_id) in force. Duplicates by (user_id,
+-- fingerprint) are skipped, matching the previous upsert(ignore_duplicates).
+CREATE OR REPLACE FUNCTION insert_transactions(payload JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+SECURITY INVOKER
+AS $$
+    WITH inserted AS (
+        INSERT INTO transactions (
+            user_id,
+            transaction_date,
+            amount,
+            description,
+            merchant_name,
+            category,
+            type,
+            fingerprint,
+            raw_data
+        )
+        SELECT
+            user_id,
+            transaction_date,
+            amount,
+            description,
+            merchant_name,
+            category,
+            type,
+            fingerprint,
+            raw_data
+        FROM jsonb_to_recordset(payload) AS t(
+            user_id UUID,
+            transaction_date TIMESTAMP WITH TIME ZONE,
+            amount NUMERIC(12, 2),
+            description TEXT,
+            merchant_name TEXT,
+            category TEXT,
+            type TEXT,
+            fingerprint TEXT,
+            raw_data JSONB
+        )
+        ON CONFLICT (user_id, fingerprint) DO NOTHING
+        RETURNING 1
+    )
+    SELECT count(*)::INTEGER FROM inserted;
+$$;
+
+GRANT EXECUTE ON FUNCTION insert_transactions(JSONB) TO authenticated;
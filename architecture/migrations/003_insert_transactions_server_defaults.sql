@@ -0,0 +1,53 @@
+-- Migration: 003_insert_transactions_server_defaults
+
+-- 1. insert_transactions fills category and type server-side.
+-- The training upload path no longer sends "category": "Uncategorized" or
+-- the amount-derived "type" with every row. A missing key arrives from
+-- jsonb_to_recordset as NULL (which would bypass the column DEFAULT), so
+-- the defaults are applied here; payloads that still carry either key
+-- keep their value.
+CREATE OR REPLACE FUNCTION insert_transactions(payload JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+SECURITY INVOKER
+AS $$
+    WITH inserted AS (
+        INSERT INTO transactions (
+            user_id,
+            transaction_date,
+            amount,
+            description,
+            merchant_name,
+            category,
+            type,
+            fingerprint,
+            raw_data
+        )
+        SELECT
+            user_id,
+            transaction_date,
+            amount,
+            description,
+            merchant_name,
+            COALESCE(category, 'Uncategorized'),
+            COALESCE(type, CASE WHEN amount < 0 THEN 'expense' ELSE 'income' END),
+            fingerprint,
+            raw_data
+        FROM jsonb_to_recordset(payload) AS t(
+            user_id UUID,
+            transaction_date TIMESTAMP WITH TIME ZONE,
+            amount NUMERIC(12, 2),
+            description TEXT,
+            merchant_name TEXT,
+            category TEXT,
+            type TEXT,
+            fingerprint TEXT,
+            raw_data JSONB
+        )
+        ON CONFLICT (user_id, fingerprint) DO NOTHING
+        RETURNING 1
+    )
+    SELECT count(*)::INTEGER FROM inserted;
+$$;
+
+GRANT EXECUTE ON FUNCTION insert_transactions(JSONB) TO authenticated;
@@ -0,0 +1,28 @@
+-- Migration: 004_claim_training_job
+
+-- 1. Atomic job claim for the polling worker (apps/worker).
+-- Picks the oldest pending job and marks it processing in one statement.
+-- FOR UPDATE SKIP LOCKED lets concurrent workers each take a different
+-- row instead of racing on the same one. Returns the claimed row, or no
+-- rows when nothing is pending.
+CREATE OR REPLACE FUNCTION claim_training_job()
+RETURNS SETOF training_jobs
+LANGUAGE sql
+SECURITY INVOKER
+AS $$
+    UPDATE training_jobs
+    SET status = 'processing', updated_at = NOW()
+    WHERE id = (
+        SELECT id
+        FROM training_jobs
+        WHERE status = 'pending'
+        ORDER BY created_at
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING *;
+$$;
+
+-- Only the worker's service-role key may claim jobs.
+REVOKE EXECUTE ON FUNCTION claim_training_job() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION claim_training_job() TO service_role;
@@ -1,8 +1,82 @@
 # packages/categorization/backends/base.py
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List
 import torch
 
+# Padded sequence lengths for embedding batches. Texts are grouped by the
+# smallest bucket that fits their token count, so one long description
+# does not pad every short merchant string to 128 tokens.
+LENGTH_BUCKETS = (8, 16, 32, 64, 128)
+
+
+def _to_device(tensor: torch.Tensor, device: torch.device) -> torch.Tensor:
+    """Copy a CPU tensor to ``device``; on CUDA via pinned memory and
+    without blocking, so the host can prepare the next bucket meanwhile."""
+    if device.type == "cuda":
+        return tensor.pin_memory().to(device, non_blocking=True)
+    return tensor.to(device)
+
+
+def bucketed_cls_embeddings(
+    tokenizer, model, device: torch.device, texts: List[str], max_length: int = 128
+) -> torch.Tensor:
+    """
+    Run ``model`` over ``texts`` in length buckets and return the first-token
+    ([CLS]) embeddings in the original order.
+
+    Texts are tokenized once without padding; each bucket is then padded
+    only to its own longest item. The attention mask already hides padding,
+    so the embeddings match a single padding=True batch. On CUDA, inputs
+    are copied from pinned memory without blocking, and nothing synchronizes
+    until the result is used, so padding and copying the next bucket
+    overlaps the current bucket's forward pass.
+
+    Runs under torch.no_grad() rather than inference_mode(): the encoder is
+    frozen, but its output feeds the trainable hyperbolic projector, and
+    inference tensors cannot be saved for backward.
+
+    Args:
+        tokenizer: HuggingFace tokenizer
+        model: HuggingFace encoder returning ``last_hidden_state``
+        device: Device to run the forward passes on
+        texts: List of text strings
+        max_length: Truncation length
+
+    Returns:
+        Tensor of shape (len(texts), hidden_size)
+    """
+    # token_type_ids are all zeros for single sentences, which is also the
+    # model default, so they are not materialized.
+    encodings = tokenizer(
+        texts, truncation=True, max_length=max_length, return_token_type_ids=False
+    )
+    buckets: Dict[int, List[int]] = {}
+    for i, ids in enumerate(encodings["input_ids"]):
+        bound = next((b for b in LENGTH_BUCKETS if len(ids) <= b), max_length)
+        buckets.setdefault(bound, []).append(i)
+
+    out = torch.empty(
+        (len(texts), model.config.hidden_size), dtype=torch.float32, device=device
+    )
+    for bound in sorted(buckets):
+        indices = buckets[bound]
+        batch = tokenizer.pad(
+            {key: [encodings[key][i] for i in indices] for key in encodings.keys()},
+            return_tensors="pt",
+        )
+        batch = {key: _to_device(value, device) for key, value in batch.items()}
+        rows = _to_device(torch.tensor(indices), out.device)
+        with torch.no_grad():
+            hidden = model(
+                **batch, output_attentions=False, output_hidden_states=False
+            ).last_hidden_state
+            # Copy the [CLS] rows out (as fp32, even from a half-precision
+            # encoder) and release the (B, L, H) sequence before the next
+            # bucket's forward pass.
+            out[rows] = hidden[:, 0, :].float()
+            del hidden
+    return out
+
 
 class BackendBase(ABC):
     """
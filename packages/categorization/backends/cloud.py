@@ -1,9 +1,11 @@
 # packages/categorization/backends/cloud.py
+import numpy as np
 import torch
-from transformers import BertTokenizer, BertModel
+from transformers import BertTokenizerFast, BertModel
 from typing import List
 
-from .base import BackendBase
+from .. import embed_cache
+from .base import BackendBase, bucketed_cls_embeddings
 
 
 class CloudBackend(BackendBase):
@@ -23,6 +25,7 @@ class CloudBackend(BackendBase):
             dim: Output dimension (768 for BERT base)
         """
         self._dim = dim
+        self._model_name = model_name
         self._device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
         # Handle MPS (Mac)
@@ -30,10 +33,18 @@ class CloudBackend(BackendBase):
             self._device = torch.device("mps")
 
         # Load tokenizer and model
-        self.tokenizer = BertTokenizer.from_pretrained(model_name)
+        self.tokenizer = BertTokenizerFast.from_pretrained(model_name)
         self.model = BertModel.from_pretrained(model_name).to(self._device)
         self.model.eval()  # Inference mode
 
+        # The encoder is frozen, so accelerators run it in half precision:
+        # bf16 on CUDA (fp32 range), fp16 on MPS. Embeddings are returned
+        # as fp32 either way.
+        if self._device.type == "cuda":
+            self.model = self.model.to(torch.bfloat16)
+        elif self._device.type == "mps":
+            self.model = self.model.to(torch.float16)
+
     @property
     def dim(self) -> int:
         return self._dim
@@ -42,6 +53,18 @@ class CloudBackend(BackendBase):
     def device(self) -> torch.device:
         return self._device
 
+    def _cache_namespace(self) -> str:
+        """
+        Embedding cache namespace: model name plus the precision the encoder
+        runs in (bf16 on CUDA, fp16 on MPS, fp32 or int8-quantized on CPU),
+        so processes on different devices never share cached vectors.
+        """
+        dtype = str(next(self.model.parameters()).dtype).replace("torch.", "")
+        quantized = any(
+            "quantized" in type(module).__module__ for module in self.model.modules()
+        )
+        return f"{self._model_name}:{dtype}{'-int8' if quantized else ''}"
+
     def embed(self, texts: List[str]) -> torch.Tensor:
         """
         Embed texts using BERT [CLS] token.
@@ -51,19 +74,39 @@ class CloudBackend(BackendBase):
 
         Returns:
             Tensor of shape (batch_size, dim) with BERT [CLS] embeddings
+
+        With EMBED_CACHE_REDIS_URL set, vectors are read from and written to
+        the embedding cache and BERT only runs on texts not found there.
+        Results then carry fp16 precision whether or not they were cached.
         """
-        # Tokenize
-        inputs = self.tokenizer(
-            texts, return_tensors="pt", padding=True, truncation=True, max_length=128
-        ).to(self._device)
-
-        # Get [CLS] embeddings
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            # Use [CLS] token representation (first token)
-            cls_embeddings = outputs.last_hidden_state[:, 0, :]
-
-        return cls_embeddings
+        if not texts or not embed_cache.enabled():
+            # [CLS] embeddings, batched by token length
+            return bucketed_cls_embeddings(
+                self.tokenizer, self.model, self._device, texts
+            )
+
+        namespace = self._cache_namespace()
+        keys = [embed_cache.cache_key(namespace, text) for text in texts]
+        vectors = embed_cache.get_many(keys)
+
+        misses = dict.fromkeys(
+            text for text, key in zip(texts, keys) if key not in vectors
+        )
+        if misses:
+            miss_texts = list(misses)
+            computed = bucketed_cls_embeddings(
+                self.tokenizer, self.model, self._device, miss_texts
+            )
+            computed = computed.cpu().numpy().astype(np.float16)
+            fresh = {
+                embed_cache.cache_key(namespace, text): vector
+                for text, vector in zip(miss_texts, computed)
+            }
+            embed_cache.put_many(fresh.items())
+            vectors.update(fresh)
+
+        stacked = np.stack([vectors[key] for key in keys]).astype(np.float32)
+        return torch.from_numpy(stacked).to(self._device)
 
     def embed_batch(self, texts: List[str]) -> torch.Tensor:
         """Alias for embed() - CloudBackend already handles batching."""
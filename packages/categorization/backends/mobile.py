@@ -1,9 +1,9 @@
 # packages/categorization/backends/mobile.py
 import torch
-from transformers import DistilBertTokenizer, DistilBertModel
+from transformers import DistilBertTokenizerFast, DistilBertModel
 from typing import List
 
-from .base import BackendBase
+from .base import BackendBase, bucketed_cls_embeddings
 
 
 class MobileBackend(BackendBase):
@@ -26,7 +26,7 @@ class MobileBackend(BackendBase):
         self._device = torch.device("cpu")  # Mobile targets CPU
 
         # Load tokenizer and model
-        self.tokenizer = DistilBertTokenizer.from_pretrained(model_name)
+        self.tokenizer = DistilBertTokenizerFast.from_pretrained(model_name)
         self.model = DistilBertModel.from_pretrained(model_name).to(self._device)
         self.model.eval()
 
@@ -48,18 +48,8 @@ class MobileBackend(BackendBase):
         Returns:
             Tensor of shape (batch_size, dim) with DistilBERT embeddings
         """
-        # Tokenize
-        inputs = self.tokenizer(
-            texts, return_tensors="pt", padding=True, truncation=True, max_length=128
-        ).to(self._device)
-
-        # Get [CLS] embeddings
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            # DistilBERT also uses first token as [CLS]-like representation
-            cls_embeddings = outputs.last_hidden_state[:, 0, :]
-
-        return cls_embeddings
+        # [CLS] embeddings, batched by token length
+        return bucketed_cls_embeddings(self.tokenizer, self.model, self._device, texts)
 
     def embed_batch(self, texts: List[str]) -> torch.Tensor:
         """Alias for embed() - MobileBackend already handles batching."""
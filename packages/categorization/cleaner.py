@@ -21,19 +21,15 @@ class TextAugmenter:
 
     def _compute_tf(self, texts: List[str]) -> Dict[str, float]:
         """Compute normalized term frequencies across corpus."""
-        if not texts:
-            return {}
-
-        # Tokenize and count
-        all_tokens = []
+        # Tokenize and count, one text at a time (no corpus-wide token list)
+        counts: Counter = Counter()
         for text in texts:
-            tokens = text.lower().split()
-            all_tokens.extend(tokens)
-
-        counts = Counter(all_tokens)
-        max_count = max(counts.values()) if counts else 1
+            counts.update(text.lower().split())
+        if not counts:
+            return {}
 
         # Normalize to [0, 1]
+        max_count = max(counts.values())
         return {term: count / max_count for term, count in counts.items()}
 
     def inverse_frequency_dropout(self, text: str, drop_prob: float = 0.3) -> str:
@@ -90,6 +86,34 @@ class TextAugmenter:
         return self.substring_sampling(dropped)
 
 
+# clean_description patterns, compiled once. They stay separate passes in
+# their original order: each removal can create new word boundaries (e.g.
+# "ATM12JAN" only exposes ATM once the date is gone), so fusing them
+# would change the output.
+_SEPARATOR_RE = re.compile(r"[*\-_]")
+_UPI_HANDLE_RE = re.compile(r"[\w\.-]+@[\w\.-]+")
+_UPI_REF_RE = re.compile(r"UPI(?:-|\/)?\d+[\w]*")
+_UPI_PREFIX_RE = re.compile(r"UPI\s*-?")
+_DATE_RE = re.compile(r"\d{2}[-\/]\d{2}[-\/]\d{2,4}")
+_DAY_MONTH_RE = re.compile(r"\d{2}[A-Z]{3}")
+_LONG_NUMBER_RE = re.compile(r"\b\d{4,}\b")
+_PAYMENT_RAIL_RE = re.compile(r"\b(POS|ECOM|ATM|MPS|IMPS|NEFT|RTGS|ACH|MBk|WDL)\b")
+_GENERIC_WORD_RE = re.compile(
+    r"\b(TXN|REF|ID|NO|TRANSFER|PAYMENT|TO|BY|FROM|BILL|IN|VIA)\b"
+)
+_NON_LETTER_RE = re.compile(r"[^A-Z\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Already-clean inputs (plain merchant names) skip the pipeline: text made
+# only of A-Z and spaces is left unchanged by every pass unless it contains
+# "UPI" or one of the whole words the rail/generic passes remove.
+_PLAIN_TEXT_RE = re.compile(r"[A-Z ]*")
+_NOISE_WORDS = frozenset(
+    "POS ECOM ATM MPS IMPS NEFT RTGS ACH WDL "
+    "TXN REF ID NO TRANSFER PAYMENT TO BY FROM BILL IN VIA".split()
+)
+
+
 def clean_description(text: str) -> str:
     """
     Cleans transaction descriptions by removing common noise patterns
@@ -101,33 +125,38 @@ def clean_description(text: str) -> str:
     # Normalize
     text = text.upper()
 
+    if (
+        _PLAIN_TEXT_RE.fullmatch(text)
+        and "UPI" not in text
+        and _NOISE_WORDS.isdisjoint(text.split())
+    ):
+        return " ".join(text.split())
+
     # NEW: Standardize separators (*, -, _) → space
-    text = re.sub(r"[*\-_]", " ", text)
+    text = _SEPARATOR_RE.sub(" ", text)
 
     # 1. Remove UPI Handles (e.g., john@okicici, 9876543210@paytm)
-    text = re.sub(r"[\w\.-]+@[\w\.-]+", "", text)
+    text = _UPI_HANDLE_RE.sub("", text)
 
     # 2. Remove "UPI/" prefix and reference numbers (e.g., UPI/123456789/Ref...)
-    text = re.sub(r"UPI(?:-|\/)?\d+[\w]*", "", text)
-    text = re.sub(r"UPI\s*-?", "", text)
+    text = _UPI_REF_RE.sub("", text)
+    text = _UPI_PREFIX_RE.sub("", text)
 
     # 3. Remove POS / ECOM / ATM indicators
-    text = re.sub(r"\b(POS|ECOM|ATM|MPS|IMPS|NEFT|RTGS|ACH|MBk|WDL)\b", "", text)
+    text = _PAYMENT_RAIL_RE.sub("", text)
 
     # 4. Remove Dates (DD-MM-YYYY, DD/MM, etc.) - diverse formats
-    text = re.sub(r"\d{2}[-\/]\d{2}[-\/]\d{2,4}", "", text)
-    text = re.sub(r"\d{2}[A-Z]{3}", "", text)  # 12JAN
+    text = _DATE_RE.sub("", text)
+    text = _DAY_MONTH_RE.sub("", text)  # 12JAN
 
     # 5. Remove pure number sequences (Order IDs, Ref nums) > 3 digits
-    text = re.sub(r"\b\d{4,}\b", "", text)
+    text = _LONG_NUMBER_RE.sub("", text)
 
     # 6. Remove generic words
-    text = re.sub(
-        r"\b(TXN|REF|ID|NO|TRANSFER|PAYMENT|TO|BY|FROM|BILL|IN|VIA)\b", "", text
-    )
+    text = _GENERIC_WORD_RE.sub("", text)
 
     # 7. Remove special characters and extra spaces
-    text = re.sub(r"[^A-Z\s]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _NON_LETTER_RE.sub(" ", text)
+    text = _WHITESPACE_RE.sub(" ", text).strip()
 
     return text
@@ -25,6 +25,12 @@ class Category(str, Enum):
     UNCATEGORIZED = "Uncategorized"
 
 
+# Trainable labels in classifier output order (matches HypCDClassifier.labels)
+CATEGORIES: list[str] = [
+    category.value for category in Category if category is not Category.UNCATEGORIZED
+]
+
+
 # Default category keywords for HypCD classifier
 DEFAULT_CATEGORY_KEYWORDS: dict[str, list[str]] = {
     Category.FOOD.value: [
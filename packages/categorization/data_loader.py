@@ -69,9 +69,9 @@ class BankStatementParser:
         raw_df = pd.read_excel(file_obj, header=None, nrows=30, engine="openpyxl")
         header_row_idx = None
 
-        for idx, row in raw_df.iterrows():
+        for idx, row in zip(raw_df.index, raw_df.itertuples(index=False, name=None)):
             # Check if this row looks like a header
-            row_str = row.astype(str).str.lower().tolist()
+            row_str = [str(v).lower() for v in row]
             if any("details" in s for s in row_str):
                 header_row_idx = idx
                 break
@@ -135,12 +135,12 @@ class BankStatementParser:
 
         # Use Entity as Cleaned_Details if available, else fallback to regex cleaning
         # This addresses the user's issue about "wdl tfr upi" being the name
-        def get_best_name(row):
-            if row["entity"] and len(row["entity"]) > 2:
-                return row["entity"]
-            return self.clean_details(row["Details"])
-
-        df["Cleaned_Details"] = df.apply(get_best_name, axis=1)
+        # Zipped column lists instead of df.apply(axis=1), which boxes every
+        # row into a Series.
+        df["Cleaned_Details"] = [
+            entity if entity and len(entity) > 2 else self.clean_details(details)
+            for entity, details in zip(df["entity"].tolist(), df["Details"].tolist())
+        ]
 
         self.df = df  # Store for inspection
         return df
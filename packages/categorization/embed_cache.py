@@ -0,0 +1,94 @@
+# packages/categorization/embed_cache.py
+"""
+Redis cache for encoder embeddings.
+
+Transaction descriptions repeat heavily (the same merchants every month), so
+the [CLS] vector of a text is stored once and reused across requests and
+workers. Vectors are keyed by an encoder namespace (model name plus the
+precision it runs in, see CloudBackend) and a BLAKE2b digest of the exact
+text fed to the encoder, and stored as raw fp16 bytes.
+
+The cache is opt-in: it is enabled only when EMBED_CACHE_REDIS_URL is set.
+Redis is treated as optional — connection errors and timeouts are logged
+and behave like misses, so embedding falls back to running the model.
+"""
+
+import hashlib
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EMBED_CACHE_REDIS_URL = os.getenv("EMBED_CACHE_REDIS_URL", "")
+EMBED_CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+# Short socket timeouts, so an unreachable Redis costs a cache miss rather
+# than stalling inference.
+EMBED_CACHE_TIMEOUT_SECONDS = 0.25
+
+
+def enabled() -> bool:
+    return bool(EMBED_CACHE_REDIS_URL)
+
+
+def cache_key(namespace: str, text: str) -> str:
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    return f"emb:{namespace}:{digest}"
+
+
+@lru_cache(maxsize=1)
+def _get_redis():
+    """
+    Client for EMBED_CACHE_REDIS_URL.
+
+    packages/ does not import from apps/, and the training pipeline runs
+    this backend outside the API, so this cannot reuse
+    apps.api.core.cache.get_redis (which reads the API's REDIS_URL).
+    """
+    import redis
+
+    return redis.from_url(
+        EMBED_CACHE_REDIS_URL,
+        socket_timeout=EMBED_CACHE_TIMEOUT_SECONDS,
+        socket_connect_timeout=EMBED_CACHE_TIMEOUT_SECONDS,
+    )
+
+
+def get_many(keys: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Fetch cached vectors in one MGET.
+
+    Returns:
+        Mapping of key -> fp16 vector for the keys that were found
+    """
+    if not keys:
+        return {}
+    try:
+        values = _get_redis().mget(keys)
+    except Exception as e:
+        logger.warning("Embedding cache unavailable: %s", e)
+        return {}
+    return {
+        key: np.frombuffer(value, dtype=np.float16)
+        for key, value in zip(keys, values)
+        if value is not None
+    }
+
+
+def put_many(items: Iterable[tuple]) -> None:
+    """Store (key, vector) pairs as fp16 in one pipelined round trip."""
+    try:
+        pipe = _get_redis().pipeline(transaction=False)
+        for key, vector in items:
+            pipe.set(
+                key,
+                np.asarray(vector, dtype=np.float16).tobytes(),
+                ex=EMBED_CACHE_TTL_SECONDS,
+            )
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Embedding cache unavailable: %s", e)
@@ -40,3 +40,15 @@ def test_mock_backend_implements_interface():
     texts = ["test 1", "test 2"]
     embeddings = backend.embed(texts)
     assert embeddings.shape == (2, 768)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="requires CUDA")
+def test_to_device_cuda_copy_is_pinned_and_exact():
+    """CUDA inputs go through pinned memory and arrive unchanged."""
+    from packages.categorization.backends.base import _to_device
+
+    ids = torch.arange(12).reshape(3, 4)
+    moved = _to_device(ids, torch.device("cuda"))
+
+    assert moved.device.type == "cuda"
+    assert torch.equal(moved.cpu(), ids)
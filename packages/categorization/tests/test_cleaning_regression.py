@@ -47,3 +47,15 @@ def test_separator_standardization():
     assert "AMAZON" in clean_description("AMAZON*PAYMENTS")
     assert "SWIGGY" in clean_description("SWIGGY-FOOD")
     assert "ZOMATO" in clean_description("ZOMATO_FOOD")
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("Swiggy  Instamart ", "SWIGGY INSTAMART"),  # plain text fast path
+        ("Transfer to Rahul", "RAHUL"),  # generic words still removed
+        ("Cupid Store", "CD STORE"),  # "UPI" inside a word still stripped
+    ],
+)
+def test_plain_text_matches_full_pipeline(raw, expected):
+    assert clean_description(raw) == expected
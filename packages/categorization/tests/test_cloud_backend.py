@@ -29,3 +29,65 @@ def test_cloud_backend_embed_single():
 
     embedding = backend.embed(["test text"])
     assert embedding.shape == (1, 128)
+
+
+def test_cloud_backend_length_buckets_match_single_batch():
+    """Bucketed embedding keeps input order and matches one padded batch."""
+    backend = CloudBackend(model_name="prajjwal1/bert-tiny", dim=128)
+
+    texts = [
+        "swiggy",
+        " ".join(["long ocr description with many tokens"] * 8),
+        "uber ride to the airport",
+    ]
+    embeddings = backend.embed(texts)
+
+    inputs = backend.tokenizer(
+        texts, return_tensors="pt", padding=True, truncation=True, max_length=128
+    ).to(backend.device)
+    with torch.no_grad():
+        expected = backend.model(**inputs).last_hidden_state[:, 0, :]
+
+    assert torch.allclose(embeddings, expected, atol=1e-5)
+
+
+def test_cloud_backend_embed_cache_skips_cached_texts(monkeypatch):
+    """With the embedding cache on, only uncached texts reach BERT."""
+    from packages.categorization import embed_cache
+    from packages.categorization.backends import cloud
+    from packages.categorization.tests.test_embed_cache import FakeRedis
+
+    fake = FakeRedis()
+    monkeypatch.setattr(embed_cache, "EMBED_CACHE_REDIS_URL", "redis://fake")
+    monkeypatch.setattr(embed_cache, "_get_redis", lambda: fake)
+    backend = CloudBackend(model_name="prajjwal1/bert-tiny", dim=128)
+
+    first = backend.embed(["swiggy", "uber", "swiggy"])
+    assert len(fake.store) == 2
+
+    encoded = []
+    real = cloud.bucketed_cls_embeddings
+
+    def spy(tokenizer, model, device, texts):
+        encoded.append(list(texts))
+        return real(tokenizer, model, device, texts)
+
+    monkeypatch.setattr(cloud, "bucketed_cls_embeddings", spy)
+    second = backend.embed(["uber", "zomato", "swiggy"])
+
+    assert encoded == [["zomato"]]
+    assert second.shape == (3, 128)
+    assert torch.equal(second[0], first[1])
+    assert torch.equal(second[2], first[0])
+
+
+def test_cloud_backend_cache_namespace_tracks_encoder_precision():
+    """Encoders in different precisions never share cached vectors."""
+    backend = CloudBackend(model_name="prajjwal1/bert-tiny", dim=128)
+    backend.model = backend.model.to(torch.float32)
+    fp32 = backend._cache_namespace()
+
+    backend.model = backend.model.to(torch.bfloat16)
+
+    assert fp32 == "prajjwal1/bert-tiny:float32"
+    assert backend._cache_namespace() == "prajjwal1/bert-tiny:bfloat16"
@@ -0,0 +1,63 @@
+# packages/categorization/tests/test_embed_cache.py
+import numpy as np
+
+from packages.categorization import embed_cache
+
+
+class FakeRedis:
+    """In-memory stand-in for the MGET / pipelined SET calls the cache makes."""
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+        self.ttls[key] = ex
+
+    def execute(self):
+        return []
+
+
+class BrokenRedis:
+    def mget(self, keys):
+        raise ConnectionError("redis down")
+
+    def pipeline(self, transaction=True):
+        raise ConnectionError("redis down")
+
+
+def test_cache_key_is_namespaced_by_encoder():
+    key = embed_cache.cache_key("bert-base-uncased:float32", "SWIGGY")
+
+    assert key.startswith("emb:bert-base-uncased:float32:")
+    assert key == embed_cache.cache_key("bert-base-uncased:float32", "SWIGGY")
+    assert key != embed_cache.cache_key("bert-base-uncased:bfloat16", "SWIGGY")
+    assert key != embed_cache.cache_key("bert-base-uncased:float32", "ZOMATO")
+
+
+def test_put_then_get_round_trips_fp16(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(embed_cache, "_get_redis", lambda: fake)
+    vector = np.array([0.1, -2.5, 3.0], dtype=np.float32)
+
+    embed_cache.put_many([("emb:m:a", vector)])
+    found = embed_cache.get_many(["emb:m:a", "emb:m:missing"])
+
+    assert list(found) == ["emb:m:a"]
+    assert found["emb:m:a"].dtype == np.float16
+    np.testing.assert_array_equal(found["emb:m:a"], vector.astype(np.float16))
+    assert fake.ttls["emb:m:a"] == embed_cache.EMBED_CACHE_TTL_SECONDS
+
+
+def test_redis_errors_behave_like_misses(monkeypatch):
+    monkeypatch.setattr(embed_cache, "_get_redis", lambda: BrokenRedis())
+
+    assert embed_cache.get_many(["emb:m:a"]) == {}
+    embed_cache.put_many([("emb:m:a", np.zeros(3))])  # does not raise
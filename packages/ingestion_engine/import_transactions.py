@@ -1,6 +1,14 @@
 import hashlib
+import os
+import numpy as np
 import pandas as pd
-from typing import IO
+from typing import IO, Union
+
+# INGEST_BACKEND picks the CSV reader: "pandas" (default) or "polars", which
+# parses on all cores (requires the polars and pyarrow packages). Only CSV
+# is affected; Excel, JSON and TSV stay on pandas. Either way the frame
+# goes through the same _normalize_dataframe step.
+CSV_BACKEND = os.getenv("INGEST_BACKEND", "pandas")
 
 
 def normalize_merchant(merchant: str) -> str:
@@ -22,6 +30,27 @@ def generate_fingerprint(iso_date: str, amount: float, merchant: str) -> str:
     return hashlib.sha256(raw_string.encode("utf-8")).hexdigest()
 
 
+def generate_fingerprints(
+    dates: pd.Series, amounts: pd.Series, merchants: pd.Series
+) -> list:
+    """
+    Column-wise generate_fingerprint(): one fingerprint per row, identical
+    to calling it on each (date, amount, merchant). Payloads are joined from
+    plain lists and each distinct merchant is normalized once.
+    """
+    merchant_values = merchants.tolist()
+    normalized = {m: normalize_merchant(m) for m in dict.fromkeys(merchant_values)}
+    payloads = zip(
+        map(str, dates.tolist()),
+        map(str, amounts.tolist()),
+        map(normalized.__getitem__, merchant_values),
+    )
+    return [
+        hashlib.sha256("|".join(payload).encode("utf-8")).hexdigest()
+        for payload in payloads
+    ]
+
+
 def _normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """
     Normalizes a DataFrame with transaction data.
@@ -130,25 +159,61 @@ def _normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     return df[result_cols]
 
 
-def parse_csv_content(file_content: IO) -> pd.DataFrame:
+def parse_csv_content(file_content: IO, encoding: str = "utf-8") -> pd.DataFrame:
     """
     Parses a CSV file object into a normalized DataFrame.
     Standard Columns: date, amount, description, merchant
+    Binary streams are decoded with ``encoding`` (UTF-8 by default).
     """
-    df = pd.read_csv(file_content)
+    if CSV_BACKEND == "polars":
+        df = _read_csv_polars(file_content, encoding)
+    else:
+        df = pd.read_csv(file_content, encoding=encoding)
     return _normalize_dataframe(df)
 
 
+def _read_csv_polars(file_content: IO, encoding: str) -> pd.DataFrame:
+    """
+    Reads a CSV with polars and hands it over as a pandas DataFrame.
+    Invalid UTF-8 is re-raised as UnicodeDecodeError, matching pd.read_csv,
+    so callers' encoding fallbacks keep working. Any other polars parse
+    error (e.g. a column changing type past the inferred schema) falls back
+    to pd.read_csv, so the polars backend never rejects a file pandas reads.
+    Missing strings come back as NaN, as they do from pd.read_csv.
+    """
+    import polars as pl
+
+    start = file_content.tell()
+    is_utf8 = encoding.lower().replace("-", "") == "utf8"
+    try:
+        df = pl.read_csv(
+            file_content,
+            encoding="utf8" if is_utf8 else encoding,
+            infer_schema_length=10_000,
+        )
+    except pl.exceptions.ComputeError as e:
+        if is_utf8 and "utf-8" in str(e).lower():
+            raise UnicodeDecodeError(encoding, b"", 0, 0, str(e)) from e
+        file_content.seek(start)
+        return pd.read_csv(file_content, encoding=encoding)
+
+    df = df.to_pandas()
+    return df.where(df.notna(), np.nan)
+
+
 def parse_file(
-    file_content: bytes, filename: str, password: str = None
+    file_content: Union[bytes, IO[bytes]], filename: str, password: str = None
 ) -> pd.DataFrame:
     """
     Parses a transaction file (CSV, Excel, JSON, TSV) based on extension/content.
+    ``file_content`` is the raw bytes or a binary file object positioned at
+    the start, e.g. an upload's spooled temp file, which is read in place.
     """
     import io
     import json as _json
 
     filename_lower = filename.lower()
+    stream = io.BytesIO(file_content) if isinstance(file_content, bytes) else file_content
 
     if (
         filename_lower.endswith(".xlsx")
@@ -158,7 +223,7 @@ def parse_file(
         # Use new BankStatementParser
         from packages.categorization.data_loader import BankStatementParser
 
-        parser = BankStatementParser(file_content, password=password)
+        parser = BankStatementParser(stream, password=password)
         try:
             df = parser.parse()
         except Exception as e:
@@ -190,18 +255,18 @@ def parse_file(
                 df[col] = "" if col != "amount" else 0.0
 
     elif filename_lower.endswith(".json"):
-        raw = _json.loads(file_content.decode("utf-8"))
+        raw = _json.load(stream)
         rows = raw if isinstance(raw, list) else raw.get("transactions", [])
         df = pd.DataFrame(rows)
         df = _normalize_dataframe(df)  # Apply shared normalization
     elif filename_lower.endswith(".tsv"):
-        text_stream = io.StringIO(file_content.decode("utf-8"))
-        df = pd.read_csv(text_stream, sep="\t")
+        # The C parser decodes as it reads, instead of materialising a
+        # decoded str plus StringIO copy.
+        df = pd.read_csv(stream, sep="\t", encoding="utf-8")
         df = _normalize_dataframe(df)  # Apply shared normalization
     else:
         # Default: treat as CSV
-        text_stream = io.StringIO(file_content.decode("utf-8"))
-        df = parse_csv_content(text_stream)
+        df = parse_csv_content(stream)
 
     # Generate merchant if missing (Common post-processing)
     # Only if we didn't use BankStatementParser (which already generates it)
@@ -1,8 +1,11 @@
-from io import StringIO
+from io import BytesIO
 from typing import List, Dict, Any
+
+import pandas as pd
+
 from packages.ingestion_engine.import_transactions import (
+    generate_fingerprints,
     parse_csv_content,
-    generate_fingerprint,
 )
 
 from packages.ingestion_engine.merchant_extractor import MerchantExtractor
@@ -15,46 +18,59 @@ def process_file_logic(file_bytes: bytes) -> List[Dict[str, Any]]:
     2. Generates fingerprints.
     3. Returns list of records ready for DB insertion.
     """
-    # Decode bytes to string
+    # Parse straight from the bytes buffer (no decoded str/StringIO copy).
+    # Legacy banking exports that are not valid UTF-8 are read as latin-1.
     try:
-        csv_text = file_bytes.decode("utf-8")
+        df = parse_csv_content(BytesIO(file_bytes))
     except UnicodeDecodeError:
-        # Fallback to latin-1? Or fail? Let's try latin-1 for banking legacy systems
-        csv_text = file_bytes.decode("latin-1")
-
-    # Parse Dataframe
-    df = parse_csv_content(StringIO(csv_text))
+        df = parse_csv_content(BytesIO(file_bytes), encoding="latin-1")
 
     # Drop rows with invalid dates or amounts before processing
     df = df.dropna(subset=["date", "amount"])
     df = df[df["date"] != "NaT"]  # Remove NaT (Not a Time) values
 
+    if df.empty:
+        return []
+
     extractor = MerchantExtractor()
 
-    results = []
-    for _, row in df.iterrows():
-        # Clean merchant
-        raw_merchant = str(row.get("merchant", ""))
-        raw_desc = str(row.get("description", ""))
-
-        # Prefer existing merchant column if valid, but clean it.
-        # If empty, use description.
-        source = raw_merchant if len(raw_merchant) > 2 else raw_desc
-        cleaned_merchant = extractor.extract(source)
-
-        # Standardize for fingerprinting
-        record = {
-            "date": row["date"],
-            "amount": float(row["amount"]),
-            "description": raw_desc,
-            "merchant": cleaned_merchant,
-        }
+    # Column-wise equivalent of the old per-row loop: str() each field,
+    # prefer a merchant longer than 2 chars over the description, and run
+    # the (pure-Python) extractor once per distinct source string.
+    raw_descs = (
+        df["description"].map(str)
+        if "description" in df.columns
+        else pd.Series("", index=df.index)
+    )
+    if "merchant" in df.columns:
+        raw_merchants = df["merchant"].map(str)
+        sources = raw_merchants.where(raw_merchants.str.len() > 2, raw_descs)
+    else:
+        sources = raw_descs
+    cleaned = {source: extractor.extract(source) for source in dict.fromkeys(sources)}
+    cleaned_merchants = sources.map(cleaned)
 
-        # Generate ID
-        record["fingerprint"] = generate_fingerprint(
-            record["date"], record["amount"], cleaned_merchant or raw_desc
-        )
+    dates = df["date"].tolist()
+    amounts = df["amount"].astype(float)
 
-        results.append(record)
+    # generate_fingerprint(date, amount, cleaned_merchant or raw_desc)
+    fingerprints = generate_fingerprints(
+        df["date"], amounts, cleaned_merchants.where(cleaned_merchants != "", raw_descs)
+    )
 
-    return results
+    return [
+        {
+            "date": date,
+            "amount": amount,
+            "description": desc,
+            "merchant": merchant,
+            "fingerprint": fingerprint,
+        }
+        for date, amount, desc, merchant, fingerprint in zip(
+            dates,
+            amounts.tolist(),
+            raw_descs.tolist(),
+            cleaned_merchants.tolist(),
+            fingerprints,
+        )
+    ]
@@ -110,3 +110,132 @@ def test_parse_file_csv_carries_method_and_status():
     assert "status" in df.columns, "parse_file should return 'status' column"
     assert df.iloc[0]["method"] == "Visa **** 3534"
     assert df.iloc[1]["status"] == "Refunded"
+
+
+def test_parse_file_csv_reads_utf8_bytes():
+    """
+    parse_file decodes CSV bytes as UTF-8 (BOM and non-ASCII text included).
+    """
+    from packages.ingestion_engine.import_transactions import parse_file
+
+    csv_bytes = "\ufeffDate,Description,Amount\n12/02/2026,Café Niloufer,-250\n".encode("utf-8")
+
+    df = parse_file(csv_bytes, "export.csv")
+
+    assert df.iloc[0]["date"] == "2026-02-12"
+    assert df.iloc[0]["description"] == "Café Niloufer"
+    assert df.iloc[0]["amount"] == -250
+
+
+def test_polars_backend_matches_pandas(monkeypatch):
+    """
+    INGEST_BACKEND=polars yields the same normalized frame as pandas.
+    """
+    import pytest
+
+    pytest.importorskip("polars")
+    pytest.importorskip("pyarrow")
+    from packages.ingestion_engine import import_transactions
+
+    csv_bytes = b"""Date,Description,Amount,Status
+12/02/2026,Music Premium,INR 299.00,Complete
+13/02/2026,YouTube Premium,INR 59.00,Refunded
+"""
+    expected = import_transactions.parse_file(csv_bytes, "export.csv")
+    monkeypatch.setattr(import_transactions, "CSV_BACKEND", "polars")
+    result = import_transactions.parse_file(csv_bytes, "export.csv")
+
+    assert result.to_dict("records") == expected.to_dict("records")
+
+
+def _fake_polars(read_csv):
+    """Minimal stand-in for the polars API _read_csv_polars touches."""
+    from types import ModuleType, SimpleNamespace
+
+    class ComputeError(Exception):
+        pass
+
+    module = ModuleType("polars")
+    module.exceptions = SimpleNamespace(ComputeError=ComputeError)
+    module.read_csv = lambda *args, **kwargs: read_csv(ComputeError, *args, **kwargs)
+    return module
+
+
+def test_polars_backend_falls_back_to_pandas_on_parse_error(monkeypatch):
+    """
+    A polars schema error (e.g. a type change past the inferred rows) is
+    parsed by pandas instead of failing the upload.
+    """
+    import sys
+
+    from packages.ingestion_engine import import_transactions
+
+    def read_csv(compute_error, file_content, **kwargs):
+        file_content.read()  # polars consumed the stream before failing
+        raise compute_error("could not parse `abc` as dtype i64 at column 'Amount'")
+
+    monkeypatch.setitem(sys.modules, "polars", _fake_polars(read_csv))
+    csv_bytes = b"Date,Description,Amount\n12/02/2026,UPI SWIGGY,-250.5\n"
+    expected = import_transactions.parse_file(csv_bytes, "export.csv")
+    monkeypatch.setattr(import_transactions, "CSV_BACKEND", "polars")
+
+    result = import_transactions.parse_file(csv_bytes, "export.csv")
+
+    assert result.to_dict("records") == expected.to_dict("records")
+
+
+def test_polars_backend_missing_strings_are_nan(monkeypatch):
+    """
+    None from polars' nullable string columns becomes NaN, as with pandas.
+    """
+    import io
+    import sys
+
+    import pandas as pd
+
+    from packages.ingestion_engine import import_transactions
+
+    frame = pd.DataFrame(
+        {"Date": ["12/02/2026"], "Description": [None], "Amount": ["-250.5"]},
+        dtype=object,
+    )
+
+    def read_csv(compute_error, file_content, **kwargs):
+        return type("Frame", (), {"to_pandas": lambda self: frame.copy()})()
+
+    monkeypatch.setitem(sys.modules, "polars", _fake_polars(read_csv))
+    monkeypatch.setattr(import_transactions, "CSV_BACKEND", "polars")
+
+    result = import_transactions.parse_csv_content(io.BytesIO(b"unused"))
+
+    assert pd.isna(result.iloc[0]["description"])
+    assert result.iloc[0]["description"] is not None
+
+
+def test_parse_file_reads_file_objects_like_bytes():
+    """
+    parse_file accepts an open binary file (e.g. an upload's spooled temp
+    file) and parses it exactly as it parses the same bytes.
+    """
+    import io
+    import json
+    from tempfile import SpooledTemporaryFile
+
+    import pandas as pd
+
+    from packages.ingestion_engine.import_transactions import parse_file
+
+    csv_bytes = b"Date,Description,Amount\n12/02/2026,UPI SWIGGY,-250.5\n"
+    json_bytes = json.dumps(
+        [{"date": "2026-02-12", "description": "Salary", "amount": 5000}]
+    ).encode()
+
+    for payload, filename in ((csv_bytes, "export.csv"), (json_bytes, "export.json")):
+        spooled = SpooledTemporaryFile()
+        spooled.write(payload)
+        spooled.seek(0)
+
+        pd.testing.assert_frame_equal(
+            parse_file(spooled, filename), parse_file(payload, filename)
+        )
+        assert not parse_file(io.BytesIO(payload), filename).empty
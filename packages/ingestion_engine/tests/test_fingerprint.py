@@ -40,3 +40,24 @@ def test_generate_fingerprint_differentiation():
 
     assert fp1 != fp2
     assert fp1 != fp3
+
+
+def test_generate_fingerprints_matches_scalar():
+    """
+    The column-wise helper returns generate_fingerprint() for every row,
+    including blank and missing merchants.
+    """
+    import pandas as pd
+
+    from packages.ingestion_engine.import_transactions import generate_fingerprints
+
+    dates = pd.Series(["2026-02-12", "2026-02-12", "2026-02-13", "2026-02-14"])
+    amounts = pd.Series([150.0, 150.0, -20.5, 3.0])
+    merchants = pd.Series(["Starbucks ", "STARBUCKS", "", None])
+
+    expected = [
+        generate_fingerprint(d, a, m)
+        for d, a, m in zip(dates.tolist(), amounts.tolist(), merchants.tolist())
+    ]
+    assert generate_fingerprints(dates, amounts, merchants) == expected
+    assert expected[0] == expected[1]
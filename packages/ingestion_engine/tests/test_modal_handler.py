@@ -46,3 +46,51 @@ def test_process_upload_logic():
         assert result[0]["amount"] == 100.00
         assert "fingerprint" in result[0]
         assert len(result[0]["fingerprint"]) == 64
+
+
+def test_process_upload_fingerprints_match_scalar_helper(monkeypatch):
+    """
+    Column-wise fingerprints equal generate_fingerprint on each record, and
+    short merchant values fall back to the description.
+    """
+    from packages.ingestion_engine import import_transactions, modal_app
+    from packages.ingestion_engine.import_transactions import generate_fingerprint
+    from packages.ingestion_engine.modal_app import process_file_logic
+
+    # modal_app binds parse_csv_content at import; undo any earlier patching
+    monkeypatch.setattr(
+        modal_app, "parse_csv_content", import_transactions.parse_csv_content
+    )
+
+    csv_content = (
+        b"Date,Description,Amount,Merchant\n"
+        b"12/02/2026,UPI SWIGGY BANGALORE,-250.5,AB\n"
+        b"13/02/2026,Salary credit,50000,ACME Corp\n"
+    )
+
+    result = process_file_logic(csv_content)
+
+    assert len(result) == 2
+    for record in result:
+        expected = generate_fingerprint(
+            record["date"], record["amount"], record["merchant"] or record["description"]
+        )
+        assert record["fingerprint"] == expected
+
+
+def test_process_upload_falls_back_to_latin1(monkeypatch):
+    """
+    Non-UTF-8 exports are parsed as latin-1 instead of failing.
+    """
+    from packages.ingestion_engine import import_transactions, modal_app
+
+    monkeypatch.setattr(
+        modal_app, "parse_csv_content", import_transactions.parse_csv_content
+    )
+    csv_content = "Date,Description,Amount\n12/02/2026,Café Coffee Day,-120\n".encode(
+        "latin-1"
+    )
+
+    result = modal_app.process_file_logic(csv_content)
+
+    assert result[0]["description"] == "Café Coffee Day"